@@ -0,0 +1,60 @@
+"""
+Benchmark suite for models, data accessors and views. Run from the project root:
+
+    python -m benchmarks --sizes 10000,100000 --save results.json
+    python -m benchmarks --sizes 10000 --baseline results.json
+
+It builds synthetic datasets of each size, and runs every case against both an InMemoryJsonFileDataAccessor and a
+JsonRestApiDataAccessor pointing to a local stand-in of the employees API. Results can be saved, and compared to a
+baseline: the command exits with code 1 if any case regressed more than --threshold.
+"""
+
+from benchmarks.cases import build_cases
+from benchmarks.datasets import make_dataset
+from benchmarks.runner import run_case, format_results, save_results, load_results, regressions
+from tests.utils import LocalEmployeesApi
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+import platform
+import sys
+
+
+def main() -> int:
+    parser = ArgumentParser(prog='python -m benchmarks', description='Runs the benchmark suite')
+    parser.add_argument('--sizes', default='10000', help='comma separated quantities of employees of the datasets')
+    parser.add_argument('--cases', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--seconds', type=float, default=1., help='minimum seconds to run each case')
+    parser.add_argument('--save', help='path of json file to save results to')
+    parser.add_argument('--baseline', help='path of json file with results to compare to')
+    parser.add_argument('--threshold', type=float, default=.1,
+                        help='relative change considered a regression when comparing to baseline (default .1)')
+    args = parser.parse_args()
+
+    from flaskr import create_app
+    app = create_app({'SECRET_KEY': 'benchmarks', 'STATIC_DATA_PATH': 'static_data', 'EMPLOYEES_API_URL': 'unused'})
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        dataset = make_dataset(size)
+        with TemporaryDirectory() as data_dir, LocalEmployeesApi(dataset.employees) as api:
+            dataset.save(data_dir)
+            for case in build_cases(app, dataset, data_dir, api.url):
+                if args.cases in case.name:
+                    results.append(run_case(case, min_seconds=args.seconds))
+                    print(format_results(results[-1:]).splitlines()[-1], file=sys.stderr)
+
+    baseline = load_results(args.baseline) if args.baseline else None
+    print(format_results(results, baseline))
+    if args.save:
+        save_results(results, args.save, {'python': platform.python_version(), 'sizes': args.sizes})
+
+    if baseline:
+        regressed = regressions(results, baseline, args.threshold)
+        if regressed:
+            print(f'\nRegressions (> {args.threshold:.0%}): {", ".join(regressed)}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
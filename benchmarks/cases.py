@@ -0,0 +1,93 @@
+from benchmarks.datasets import Dataset
+from benchmarks.runner import Case
+from data_access import InMemoryJsonFileDataAccessor, JsonRestApiDataAccessor, MmapJsonFileDataAccessor, DataAccessor
+from codec import available_codecs
+from flask import Flask
+from itertools import cycle
+from random import Random
+from typing import List
+import os
+
+# Relationships expanded by the expansion benchmark cases
+EXPAND = ['manager.manager.department.superdepartment', 'department.superdepartment', 'office']
+
+
+def build_cases(app: Flask, dataset: Dataset, data_dir: str, api_url: str, batch: int = 1000,
+                page: int = 100) -> List[Case]:
+    """
+    Builds the benchmark cases for a dataset
+
+    :param app: app created with create_app, used to import the models and to test the views
+    :param dataset: dataset whose data is used
+    :param data_dir: directory where the dataset was saved (see Dataset.save)
+    :param api_url: url of a tests.utils.LocalEmployeesApi serving the dataset's employees
+    :param batch: quantity of objects processed per operation by models cases
+    :param page: quantity of objects fetched per operation by accessors and views cases
+    :return: list of cases, prefixed by the quantity of employees of the dataset
+    """
+
+    from flaskr.employees import Office, Department, Employee
+
+    size = len(dataset.employees)
+    random = Random(0)
+    offsets = cycle([random.randrange(0, max(size - page, 1)) for _ in range(1000)])
+    keys = cycle([random.sample(range(1, size + 1), min(page, size)) for _ in range(100)])
+    retrieve_keys = cycle([random.randint(1, size) for _ in range(1000)])
+    rows = dataset.employees[:batch]
+
+    in_memory = InMemoryJsonFileDataAccessor(os.path.join(data_dir, 'employees.json'))
+    mmap_file = MmapJsonFileDataAccessor(os.path.join(data_dir, 'employees.json'))
+    rest = JsonRestApiDataAccessor(f'{api_url}/bigcorp/employees', timeout=10.)
+
+    def use_accessor(accessor: DataAccessor):
+        def setup():
+            Office._data_accessor = InMemoryJsonFileDataAccessor(os.path.join(data_dir, 'offices.json'))
+            Department._data_accessor = InMemoryJsonFileDataAccessor(os.path.join(data_dir, 'departments.json'))
+            Employee._data_accessor = accessor
+        return setup
+
+    use_in_memory = use_accessor(in_memory)
+    objects = Employee.from_rows(rows)
+    expanded = []
+
+    def expand_batch():
+        use_in_memory()
+        expanded[:] = Employee.get_related_models(objects, *EXPAND)
+
+    client = app.test_client()
+    list_url = f'/employees?limit={page}&{"&".join(f"expand={e}" for e in EXPAND)}'
+
+    cases = [
+        Case('model.init', lambda: [Employee(**r) for r in rows], batch),
+        Case('model.from_rows', lambda: Employee.from_rows(rows), batch),
+        Case('model.get_related_models', lambda: Employee.get_related_models(objects, *EXPAND), batch, use_in_memory),
+        Case('model.to_dict', lambda: [e.to_dict() for e in expanded], batch, expand_batch),
+    ]
+    for name, accessor, setup in [('in_memory', in_memory, use_in_memory), ('mmap', mmap_file, use_accessor(mmap_file)),
+                                  ('rest', rest, use_accessor(rest))]:
+        cases += [
+            Case(f'accessor.{name}.get', lambda a=accessor: a.get(Employee, limit=page, offset=next(offsets)), page,
+                 setup),
+            Case(f'accessor.{name}.get_by_keys', lambda a=accessor: a.get_by_keys(Employee, *next(keys)), page, setup),
+            Case(f'view.{name}.list_expand', lambda: client.get(f'{list_url}&offset={next(offsets)}'), page, setup),
+            Case(f'view.{name}.retrieve_expand',
+                 lambda: client.get(f'/employees/{next(retrieve_keys)}?expand=manager.manager&expand=office'), 1,
+                 setup),
+        ]
+
+    # JSON codecs: CPU time to decode an upstream page of employees and to encode a response page of expanded employees
+    upstream_page = available_codecs()['json'].dumps(dataset.employees[:page])
+    response_page = []
+
+    def expand_response_page():
+        use_in_memory()
+        response_page[:] = [o.to_dict() for o in Employee.get(limit=page, with_related=EXPAND)]
+
+    for name, json_codec in available_codecs().items():
+        cases += [
+            Case(f'codec.{name}.decode_upstream_page', lambda c=json_codec: c.loads(upstream_page), page),
+            Case(f'codec.{name}.encode_response_page', lambda c=json_codec: c.dumps(response_page), page,
+                 expand_response_page),
+        ]
+
+    return [c._replace(name=f'{size}/{c.name}') for c in cases]
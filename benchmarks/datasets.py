@@ -0,0 +1,66 @@
+from typing import Dict, List, NamedTuple
+from random import Random
+import json
+import os
+
+
+class Dataset(NamedTuple):
+    """Synthetic rows of data for offices, departments and employees"""
+    offices: List[Dict]
+    departments: List[Dict]
+    employees: List[Dict]
+
+    def save(self, dir_path: str) -> None:
+        """Saves the dataset as offices.json, departments.json and employees.json files in dir_path"""
+
+        os.makedirs(dir_path, exist_ok=True)
+        for name, rows in self._asdict().items():
+            with open(os.path.join(dir_path, f'{name}.json'), 'w') as f:
+                json.dump(rows, f)
+
+
+def make_dataset(employees: int, offices: int = 20, department_width: int = 5, department_depth: int = 4,
+                 manager_chain_depth: int = 10, seed: int = 0) -> Dataset:
+    """
+    Builds a synthetic dataset
+
+    :param employees: quantity of employees. Benchmarks are meant to be run with 10k to 1M employees
+    :param offices: quantity of offices
+    :param department_width: quantity of subdepartments of each department (and of top level departments)
+    :param department_depth: levels of the departments tree. The tree holds width + width^2 + ... + width^depth
+     departments
+    :param manager_chain_depth: length of the chains of managers. Each employee's manager is the previous employee,
+     except for the first of every chain, that has no manager
+    :param seed: seed for random assignment of departments and offices to employees
+    :return: Dataset with all rows
+    """
+
+    random = Random(seed)
+    office_rows = [
+        {'id': i, 'city': f'City {i}', 'country': f'Country {i % 5}', 'address': f'{i} Main St'}
+        for i in range(1, offices + 1)
+    ]
+
+    department_rows = []
+    parents = [None]
+    for _ in range(department_depth):
+        level = []
+        for parent in parents:
+            for _ in range(department_width):
+                key = len(department_rows) + 1
+                department_rows.append({'id': key, 'name': f'Department {key}', 'superdepartment': parent})
+                level.append(key)
+        parents = level
+
+    employee_rows = [
+        {
+            'id': i,
+            'first': f'First {i}',
+            'last': f'Last {i}',
+            'manager': i - 1 if (i - 1) % manager_chain_depth else None,
+            'department': random.randint(1, len(department_rows)),
+            'office': random.randint(1, offices) if i % 7 else None,
+        } for i in range(1, employees + 1)
+    ]
+
+    return Dataset(offices=office_rows, departments=department_rows, employees=employee_rows)
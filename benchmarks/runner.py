@@ -0,0 +1,122 @@
+from typing import Callable, Dict, List, NamedTuple, Optional
+from time import perf_counter, process_time
+import json
+
+
+class Case(NamedTuple):
+    """
+    A benchmark case: fn is called once per operation, and each operation processes items_per_op items. If informed,
+    setup is called once before running the case
+    """
+    name: str
+    fn: Callable[[], object]
+    items_per_op: int = 1
+    setup: Optional[Callable[[], object]] = None
+
+
+class Result(NamedTuple):
+    name: str
+    operations: int
+    items_per_op: int
+    seconds: float
+    ops_per_sec: float
+    items_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    cpu_ms: float
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Returns the p percentile (0 to 100) of already sorted values, using nearest rank"""
+
+    if not sorted_values:
+        return 0.
+    rank = max(int(round(p / 100. * len(sorted_values) + .5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_case(case: Case, min_seconds: float = 1., min_operations: int = 10, warmup: int = 2) -> Result:
+    """
+    Runs a benchmark case until both min_seconds and min_operations are reached, timing every operation
+
+    :param case: case to run
+    :param min_seconds: minimum time to run the case (without counting warmup operations)
+    :param min_operations: minimum quantity of timed operations
+    :param warmup: quantity of operations run before timing (to fill caches, open connections, etc)
+    :return: Result with throughput, latency percentiles and mean CPU time per operation (of the whole process, so it
+     includes the time spent by the stand-in API on requests)
+    """
+
+    if case.setup:
+        case.setup()
+    for _ in range(warmup):
+        case.fn()
+
+    durations = []
+    cpu_start = process_time()
+    start = perf_counter()
+    while len(durations) < min_operations or perf_counter() - start < min_seconds:
+        op_start = perf_counter()
+        case.fn()
+        durations.append(perf_counter() - op_start)
+    seconds = perf_counter() - start
+    cpu_seconds = process_time() - cpu_start
+
+    durations.sort()
+    return Result(
+        name=case.name,
+        operations=len(durations),
+        items_per_op=case.items_per_op,
+        seconds=seconds,
+        ops_per_sec=len(durations) / seconds,
+        items_per_sec=len(durations) * case.items_per_op / seconds,
+        p50_ms=percentile(durations, 50) * 1000,
+        p99_ms=percentile(durations, 99) * 1000,
+        cpu_ms=cpu_seconds / len(durations) * 1000,
+    )
+
+
+def format_results(results: List[Result], baseline: Optional[Dict[str, Dict]] = None) -> str:
+    """Returns a table with the results. If baseline results are informed, includes the change of each result"""
+
+    lines = [f'{"case":<48} {"ops/s":>10} {"items/s":>12} {"p50 ms":>9} {"p99 ms":>9} {"cpu ms":>9}' +
+             (f' {"Δ items/s":>10} {"Δ p50":>8} {"Δ p99":>8}' if baseline else '')]
+    for r in results:
+        line = f'{r.name:<48} {r.ops_per_sec:>10.1f} {r.items_per_sec:>12.1f} {r.p50_ms:>9.3f} {r.p99_ms:>9.3f}' \
+            f' {r.cpu_ms:>9.3f}'
+        if baseline:
+            base = baseline.get(r.name)
+            line += (
+                f' {change(base["items_per_sec"], r.items_per_sec):>10} {change(base["p50_ms"], r.p50_ms):>8}'
+                f' {change(base["p99_ms"], r.p99_ms):>8}'
+            ) if base else f' {"(new)":>10}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def change(before: float, after: float) -> str:
+    return f'{(after - before) / before * 100:+.1f}%' if before else '-'
+
+
+def regressions(results: List[Result], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Returns the names of the cases whose throughput dropped, or p50 latency grew, more than threshold (i.e. 0.1 for
+    10%) compared to their baseline results
+    """
+
+    return [
+        r.name for r in results if r.name in baseline and (
+            r.items_per_sec < baseline[r.name]['items_per_sec'] * (1 - threshold) or
+            r.p50_ms > baseline[r.name]['p50_ms'] * (1 + threshold)
+        )
+    ]
+
+
+def save_results(results: List[Result], file_path: str, metadata: Dict = None) -> None:
+    with open(file_path, 'w') as f:
+        json.dump({'metadata': metadata or {}, 'results': {r.name: r._asdict() for r in results}}, f, indent=2)
+
+
+def load_results(file_path: str) -> Dict[str, Dict]:
+    with open(file_path) as f:
+        return json.load(f)['results']
@@ -0,0 +1 @@
+from codec.json_codec import *
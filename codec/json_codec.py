@@ -0,0 +1,110 @@
+from typing import Any, Union, IO, Dict, Optional, Callable
+import json
+import os
+
+
+class JsonCodec:
+    """
+    Base JsonCodec class. Encodes and decodes JSON using the standard library json module. Subclasses use faster
+    third party libraries, when installed.
+    """
+
+    name = 'json'
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodes a JSON document"""
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes obj as a compact, utf-8 JSON document"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def load(self, file: IO) -> Any:
+        """Decodes a JSON document from a file opened in either text or binary mode"""
+        return self.loads(file.read())
+
+
+class OrjsonCodec(JsonCodec):
+    """JsonCodec using orjson library"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+
+class UjsonCodec(JsonCodec):
+    """JsonCodec using ujson library"""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode()
+
+
+# Codecs by name, in order of preference
+CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    JsonCodec.name: JsonCodec,
+}
+
+
+def available_codecs() -> Dict[str, JsonCodec]:
+    """Returns an instance of every codec whose library is installed, by name, in order of preference"""
+
+    codecs = {}
+    for name, codec_type in CODECS.items():
+        try:
+            codecs[name] = codec_type()
+        except ImportError:
+            pass
+    return codecs
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Returns the codec with the informed name, or the fastest installed codec if name is None. Falls back to the
+    standard library json codec if the requested codec is not installed
+
+    :param name: name of the codec (see CODECS)
+    :return: JsonCodec
+    """
+
+    if name is not None and name not in CODECS:
+        raise ValueError(f'Unknown JSON codec {name}. Should be one of: {", ".join(CODECS)}')
+
+    codecs = available_codecs()
+    if name is None:
+        return next(iter(codecs.values()))
+    return codecs.get(name) or codecs[JsonCodec.name]
+
+
+# Codec used by the whole project. Set JSON_CODEC environment variable to force a specific codec
+codec = get_codec(os.environ.get('JSON_CODEC') or None)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return codec.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    return codec.dumps(obj)
+
+
+def load(file: IO) -> Any:
+    return codec.load(file)
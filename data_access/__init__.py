@@ -1,3 +1,11 @@
 from data_access.data_accesor import *
 from data_access.in_memory_json_file import *
 from data_access.json_rest_api import *
+from data_access.http_session import *
+from data_access.cached import *
+from data_access.single_flight import *
+from data_access.snapshot import *
+from data_access.mirrored import *
+from data_access.circuit_breaker import *
+from data_access.mmap_json_file import *
+from data_access.binary_snapshot import *
@@ -0,0 +1,145 @@
+from typing import Dict, List, Any, Optional, Tuple, NamedTuple
+import marshal
+import struct
+import sys
+import os
+import codec
+
+
+# Binary snapshot layout: MAGIC, header length (4 bytes, little endian), marshalled header, marshalled columns and key
+#  index
+MAGIC = b'GLIDESNAP'
+# Bumped whenever the layout changes. Snapshots written by another format version (or by another Python version, whose
+#  marshal format may differ) are ignored
+SNAPSHOT_VERSION = 2
+_HEADER_LENGTH = struct.Struct('<I')
+
+Columns = Dict[str, List[Any]]
+
+
+class SnapshotData(NamedTuple):
+    """Data of a binary snapshot: the values of each field, and the positions of the objects sorted by key"""
+    columns: Columns
+    key_order: Optional[List[int]]
+
+
+def _format_version() -> str:
+    return f'{SNAPSHOT_VERSION}/{marshal.version}/{sys.version_info[0]}.{sys.version_info[1]}'
+
+
+def _source_signature(source_path: str) -> Dict[str, int]:
+    stat = os.stat(source_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def compile_snapshot(source_path: str, snapshot_path: str = None, key: str = 'id') -> str:
+    """
+    Compiles a JSON file with an array of objects into a binary snapshot: the values of each field stored as a column,
+    with a header holding the format version, the schema (field names and the types of their values), the key field and
+    the size and modification time of the source file, used to detect stale snapshots. Objects with duplicated keys are
+    dropped (only the first one is kept), and the positions of the objects sorted by key are stored as a prebuilt key
+    index, so that objects can be paged through in key order without sorting them once loaded.
+    The snapshot is written to a temporary file and moved into place, so readers never see a partially written snapshot.
+    If writing it fails, the temporary file is removed
+
+    :param source_path: path to the JSON file
+    :param snapshot_path: path to the snapshot file. If None, source_path with a .snapshot suffix is used
+    :param key: name of the key field of the objects
+    :return: path to the snapshot file
+    """
+
+    snapshot_path = snapshot_path or f'{source_path}.snapshot'
+    signature = _source_signature(source_path)
+    with open(source_path, 'rb') as f:
+        rows = codec.load(f)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f'{source_path} is not a JSON array of objects')
+
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        if key not in row:
+            raise ValueError(f"Object {row} of {source_path} has no '{key}' field")
+        if row[key] not in seen:
+            seen.add(row[key])
+            unique_rows.append(row)
+
+    field_names = list(dict.fromkeys(name for row in unique_rows for name in row))
+    columns = {name: [row.get(name) for row in unique_rows] for name in field_names}
+    try:
+        key_order = sorted(range(len(unique_rows)), key=lambda i: unique_rows[i][key])
+    except TypeError:
+        # Keys of different types can't be sorted
+        key_order = None
+    header = marshal.dumps({
+        'version': _format_version(),
+        'key': key,
+        'schema': {name: sorted({type(v).__name__ for v in values}) for name, values in columns.items()},
+        'source': signature,
+        'count': len(unique_rows),
+    })
+
+    tmp_path = f'{snapshot_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            marshal.dump((columns, key_order), f)
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        # The partially written snapshot is removed, and the previous one (if any) left untouched
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return snapshot_path
+
+
+def _parse_header(data: bytes) -> Optional[Tuple[Dict[str, Any], int]]:
+    """Internal method that returns the header of snapshot data and the offset of its columns, or None if invalid"""
+
+    header_start = len(MAGIC) + _HEADER_LENGTH.size
+    if data[:len(MAGIC)] != MAGIC or len(data) < header_start:
+        return None
+    header_length, = _HEADER_LENGTH.unpack(data[len(MAGIC):header_start])
+    try:
+        header = marshal.loads(data[header_start:header_start + header_length])
+    except (ValueError, EOFError, TypeError):
+        return None
+    if not isinstance(header, dict) or header.get('version') != _format_version():
+        return None
+    return header, header_start + header_length
+
+
+def read_snapshot(snapshot_path: str, source_path: str = None, key: str = 'id') -> Optional[SnapshotData]:
+    """
+    Reads the columns and key index of a binary snapshot compiled by compile_snapshot, if it is valid
+
+    :param snapshot_path: path to the snapshot file
+    :param source_path: if informed, path to the JSON file the snapshot was compiled from. If it was modified after
+     compiling the snapshot, the snapshot is stale and None is returned
+    :param key: name of the key field the snapshot should be indexed by
+    :return: SnapshotData with the list of values of each field and the key index, or None if the snapshot is missing,
+     invalid or stale
+    """
+
+    try:
+        with open(snapshot_path, 'rb') as f:
+            data = f.read()
+        parsed = _parse_header(data)
+        if parsed is None:
+            return None
+        header, columns_offset = parsed
+        if header.get('key') != key or \
+                source_path is not None and header.get('source') != _source_signature(source_path):
+            return None
+        columns, key_order = marshal.loads(memoryview(data)[columns_offset:])
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    if not isinstance(columns, dict) or list(columns) != list(header['schema']) or \
+            any(len(values) != header['count'] for values in columns.values()) or \
+            key_order is not None and len(key_order) != header['count']:
+        return None
+    return SnapshotData(columns, key_order)
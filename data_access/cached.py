@@ -0,0 +1,294 @@
+from data_access.data_accesor import DataAccessor, Model, ModelType
+from typing import List, Hashable, Dict, Any, Callable, Tuple, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic
+
+
+class CacheStats:
+    """Thread safe hits, stale hits, misses and evictions counters of a cache"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _count(self, hits: int = 0, misses: int = 0, evictions: int = 0, stale_hits: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.stale_hits += stale_hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits, 'stale_hits': self.stale_hits, 'misses': self.misses, 'evictions': self.evictions
+            }
+
+
+class LRUCache:
+    """
+    Thread safe Least Recently Used cache, with a Time To Live for its entries. Once it holds max_entries entries, the
+    least recently used entry is evicted for every new one. Expired entries are kept for stale_ttl more seconds, during
+    which they can still be looked up as stale entries (see lookup_many)
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, max_entries: int, clock: Callable[[], float] = monotonic, stale_ttl: float = 0.):
+        """
+        :param ttl: Time To Live of entries, in seconds
+        :param max_entries: maximum quantity of entries held by the cache. Bounds its memory usage
+        :param clock: function that returns current time in seconds. Can be replaced for testing purposes
+        :param stale_ttl: seconds that entries are kept as stale once expired
+        """
+
+        if max_entries < 1:
+            raise ValueError('max_entries should be >= 1')
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup_many(self, keys: List[Hashable]) -> Tuple[Dict[Hashable, Any], Dict[Hashable, Any]]:
+        """
+        Returns cached values for the informed keys, split into non expired values and stale values (expired less than
+        stale_ttl seconds ago)
+
+        :param keys: keys to look up
+        :return: dict with the keys found in the cache and their values, and dict with the stale keys and their values
+        """
+
+        now = self._clock()
+        found, stale = {}, {}
+        with self._lock:
+            for key in keys:
+                expires_at, value = self._entries.get(key, (None, LRUCache._MISSING))
+                if value is LRUCache._MISSING:
+                    continue
+                if expires_at <= now:
+                    if expires_at + self.stale_ttl <= now:
+                        del self._entries[key]
+                    else:
+                        stale[key] = value
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        self.stats._count(hits=len(found), stale_hits=len(stale), misses=len(keys) - len(found) - len(stale))
+        return found, stale
+
+    def get_many(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Returns cached, non expired, values for the informed keys
+
+        :param keys: keys to look up
+        :return: dict with the keys found in the cache and their values
+        """
+
+        return self.lookup_many(keys)[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self.get_many([key]).get(key, default)
+
+    def set_many(self, values: Dict[Hashable, Any]) -> None:
+        """Stores all values, with their ttl starting now. If ttl is 0 (caching disabled), values are not stored"""
+
+        if self.ttl <= 0:
+            return
+        expires_at = self._clock() + self.ttl
+        evictions = 0
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evictions += 1
+        self.stats._count(evictions=evictions)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.set_many({key: value})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedDataAccessor(DataAccessor):
+    """
+    CachedDataAccessor wraps any other DataAccessor, caching the objects it returns across requests. Objects fetched by
+    key are cached by key, and lists fetched with get are cached by page (limit and offset). Objects from cached pages
+    are also available to be fetched by key.
+    If stale_ttl is informed, expired data is still served during stale_ttl more seconds (stale-while-revalidate),
+    while it is fetched again in background. If fetching it fails, stale data keeps being served until stale_ttl ends.
+    Keys that the wrapped data accessor didn't find are also cached (as missing) during negative_ttl seconds. If ttl is
+    0, only keys not found are cached.
+    """
+
+    def __init__(self, data_accessor: DataAccessor, ttl: float = 60., max_entries: int = 10000,
+                 max_pages: int = 1000, clock: Callable[[], float] = monotonic, stale_ttl: float = 0.,
+                 negative_ttl: float = 10., max_negative_entries: int = 10000):
+        """
+        :param data_accessor: DataAccessor whose results are cached
+        :param ttl: time in seconds during which cached data is served before fetching it again. If 0, data is not
+         cached (keys not found still are, see negative_ttl)
+        :param max_entries: maximum quantity of objects cached by key
+        :param max_pages: maximum quantity of pages cached
+        :param clock: function that returns current time in seconds. Can be replaced for testing purposes
+        :param stale_ttl: time in seconds, after ttl, during which expired data is served while it is fetched again in
+         background. If 0, expired data is fetched again before being served
+        :param negative_ttl: time in seconds during which keys not found are not fetched again. If 0, keys not found are
+         always fetched again
+        :param max_negative_entries: maximum quantity of keys not found cached
+        """
+
+        self._data_accessor = data_accessor
+        self._objects = LRUCache(ttl, max_entries, clock=clock, stale_ttl=stale_ttl)
+        self._pages = LRUCache(ttl, max_pages, clock=clock, stale_ttl=stale_ttl)
+        self._missing = LRUCache(negative_ttl, max_negative_entries, clock=clock) if negative_ttl > 0 else None
+        self._revalidator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-revalidate') \
+            if stale_ttl > 0 else None
+        self._revalidating = set()
+        self._revalidating_lock = Lock()
+        self.revalidations = 0
+        self.failed_revalidations = 0
+
+    @property
+    def supports_keyset_pagination(self) -> bool:
+        return self._data_accessor.supports_keyset_pagination
+
+    @property
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns hits, stale hits, misses and evictions counters for objects fetched by key, for pages, and for keys not
+        found (missing_keys), and counters of background revalidations of stale data
+        """
+
+        return {
+            'objects': self._objects.stats.to_dict(),
+            'pages': self._pages.stats.to_dict(),
+            'missing_keys': self._missing.stats.to_dict() if self._missing is not None else CacheStats().to_dict(),
+            'revalidations': {'revalidations': self.revalidations, 'failed_revalidations': self.failed_revalidations},
+        }
+
+    def clear(self) -> None:
+        """Removes all cached data"""
+        self._objects.clear()
+        self._pages.clear()
+        if self._missing is not None:
+            self._missing.clear()
+
+    def _revalidate(self, cache_keys: List[Hashable], fetch: Callable[[List[Hashable]], Any]) -> None:
+        """
+        Internal method that runs fetch in background to refresh the stale cache_keys that are not already being
+        refreshed (fetch receives them as argument). Errors are counted and ignored: stale data keeps being served
+        """
+
+        with self._revalidating_lock:
+            cache_keys = [k for k in cache_keys if k not in self._revalidating]
+            if not cache_keys:
+                return
+            self._revalidating.update(cache_keys)
+
+        def run():
+            try:
+                fetch(cache_keys)
+                self.revalidations += 1
+            except Exception:
+                self.failed_revalidations += 1
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.difference_update(cache_keys)
+
+        self._revalidator.submit(run)
+
+    @staticmethod
+    def _page_cache_key(model_type: ModelType, limit: Optional[int], offset: Optional[int],
+                        kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        """Returns the cache key for a page, or None if the page can't be cached (unhashable kwargs)"""
+
+        key = (model_type, limit, offset or 0, tuple(sorted(
+            (k, tuple(sorted(v.items())) if isinstance(v, dict) else v) for k, v in kwargs.items()
+        )))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _fetch_page(self, page_key: Optional[Hashable], model_type: ModelType, limit: Optional[int],
+                    offset: Optional[int], kwargs: Dict[str, Any]) -> List[Model]:
+        """Internal method that fetches a page from the wrapped data accessor, and caches it and its objects"""
+
+        page = list(self._data_accessor.get(model_type, limit=limit, offset=offset, **kwargs))
+        if page_key is not None:
+            self._pages.set(page_key, tuple(page))
+        self._objects.set_many({(model_type, o.key): o for o in page})
+        return page
+
+    def get(self, model_type: ModelType, limit: int = None, offset: int = None, **kwargs: Any) -> List[Model]:
+        """
+        Fetches data from cache, or from the wrapped data accessor if the page is not cached
+
+        :param model_type: the class of the model whose data is being fetched
+        :param limit: if informed, limits the quantity of objects to fetch
+        :param offset: offset value. If informed, start fetching data from this position
+        :param kwargs: any other arbitrary kwargs that the wrapped data accessor might need to retrieve the data
+        :return: list of models of type model_type
+        """
+
+        page_key = self._page_cache_key(model_type, limit, offset, kwargs)
+        if page_key is not None:
+            found, stale = self._pages.lookup_many([page_key])
+            if page_key in found:
+                return list(found[page_key])
+            if page_key in stale:
+                self._revalidate([page_key], lambda _: self._fetch_page(page_key, model_type, limit, offset, kwargs))
+                return list(stale[page_key])
+
+        return self._fetch_page(page_key, model_type, limit, offset, kwargs)
+
+    def _fetch_keys(self, model_type: ModelType, keys: List[Hashable]) -> Dict[Hashable, Model]:
+        """
+        Internal method that fetches objects by key from the wrapped data accessor, and caches them. Keys not found are
+        cached as missing
+        """
+
+        fetched = {(model_type, o.key): o for o in self._data_accessor.get_by_keys(model_type, *keys)}
+        self._objects.set_many(fetched)
+        if self._missing is not None:
+            self._missing.set_many({(model_type, k): True for k in keys if (model_type, k) not in fetched})
+        return fetched
+
+    def get_by_keys(self, model_type: ModelType, *keys: Hashable) -> List[Model]:
+        """
+        Fetches data by object keys from cache. Only the keys that are not cached, neither as missing, are fetched from
+        the wrapped data accessor
+
+        :param model_type: the class of the model whose data is being fetched
+        :param keys: inform 0 to n keys to fetch data from related objects
+        :return: list of models of type model_type, in the order of the informed keys
+        """
+
+        cached, stale = self._objects.lookup_many([(model_type, k) for k in keys])
+        if stale:
+            self._revalidate(list(stale), lambda cache_keys: self._fetch_keys(model_type, [k for _, k in cache_keys]))
+            cached.update(stale)
+        missing_keys = list(dict.fromkeys(k for k in keys if (model_type, k) not in cached))
+        if missing_keys and self._missing is not None:
+            known_missing = self._missing.get_many([(model_type, k) for k in missing_keys])
+            missing_keys = [k for k in missing_keys if (model_type, k) not in known_missing]
+        if missing_keys:
+            cached.update(self._fetch_keys(model_type, missing_keys))
+
+        return [cached[(model_type, k)] for k in keys if (model_type, k) in cached]
@@ -0,0 +1,122 @@
+from typing import Callable, Any, Dict, Optional
+from threading import Lock
+from time import monotonic
+
+
+class CircuitBreaker:
+    """
+    Thread safe circuit breaker, to stop sending requests to a failing service. It starts closed: calls are run, and
+    consecutive failures are counted. Once failure_threshold consecutive calls failed, it opens: calls fail fast with an
+    OpenError, without being run, for reset_timeout seconds. Then it is half open: a single trial call is run (others
+    keep failing fast) and, if it succeeds the breaker closes again, otherwise it opens for another reset_timeout.
+    Only the trial call decides whether a half open breaker closes or opens again: calls started before the breaker
+    opened that finish afterwards are ignored
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30., clock: Callable[[], float] = monotonic,
+                 is_failure: Optional[Callable[[BaseException], bool]] = None):
+        """
+        :param failure_threshold: quantity of consecutive failed calls that opens the breaker. Should be >= 1
+        :param reset_timeout: seconds that the breaker stays open before letting a trial call through
+        :param clock: function that returns current time in seconds. Can be replaced for testing purposes
+        :param is_failure: function that tells whether an error raised by a call is a failure of the service. Errors
+         that are not (i.e. invalid requests) are raised without counting as failures. If None, every error is a failure
+        """
+
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold should be >= 1')
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._is_failure = is_failure
+        self._lock = Lock()
+        self._state = CircuitBreaker.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.rejected_calls = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Returns current state: closed, open or half_open"""
+
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == CircuitBreaker.OPEN and self._clock() >= self._opened_at + self.reset_timeout:
+            self._state = CircuitBreaker.HALF_OPEN
+        return self._state
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'consecutive_failures': self._failures,
+                'times_opened': self.times_opened,
+                'rejected_calls': self.rejected_calls,
+            }
+
+    def _before_call(self) -> bool:
+        """Internal method that raises OpenError if the call can't be run. Returns True if it is the trial call"""
+
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitBreaker.CLOSED:
+                return False
+            if state == CircuitBreaker.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected_calls += 1
+        raise CircuitBreaker.OpenError(
+            f'Error fetching data: circuit breaker is open after {self.failure_threshold} consecutive failures'
+        )
+
+    def _open(self) -> None:
+        self._state = CircuitBreaker.OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+
+    def _after_call(self, failed: bool, trial: bool) -> None:
+        with self._lock:
+            if trial:
+                self._trial_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    self._failures = 0
+                    self._state = CircuitBreaker.CLOSED
+            elif self._state == CircuitBreaker.CLOSED:
+                # Calls that finish once the breaker is not closed started before it opened, and are ignored
+                if not failed:
+                    self._failures = 0
+                    return
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._open()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Runs fn, unless the breaker is open, in which case an OpenError is raised without running it
+
+        :param fn: function to run
+        :return: fn's result
+        """
+
+        trial = self._before_call()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._after_call(failed=self._is_failure is None or self._is_failure(e), trial=trial)
+            raise
+        self._after_call(failed=False, trial=trial)
+        return result
+
+    class OpenError(Exception):
+        """Custom exception to signal that a call was not run because the circuit breaker is open"""
+        pass
@@ -0,0 +1,18 @@
+from data_access.binary_snapshot import compile_snapshot
+from typing import List
+import argparse
+
+
+def main(args: List[str] = None) -> None:
+    """Compiles the JSON files informed as command line arguments into binary snapshots (see compile_snapshot)"""
+
+    parser = argparse.ArgumentParser(description='Compiles JSON files into binary snapshots (<file>.snapshot)')
+    parser.add_argument('files', nargs='+', help='JSON files with an array of objects')
+    parser.add_argument('--key', default='id', help='key field of the objects')
+    parsed = parser.parse_args(args)
+    for file in parsed.files:
+        print(compile_snapshot(file, key=parsed.key))
+
+
+if __name__ == '__main__':
+    main()
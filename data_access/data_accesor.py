@@ -1,22 +1,45 @@
-from models import Model, ModelType
-from typing import Hashable, Union, Iterable
+from models import Model, ModelType, ModelException
+from typing import Hashable, Union, Iterable, Dict, Tuple, Optional, Any
+
+
+# Filters map field names to the values allowed for each field (a single value for equality filters)
+Filters = Dict[str, Tuple[Hashable, ...]]
 
 
 class DataAccessor:
     """Base DataAccessor class. All specific DataAccessors should inherit from this class."""
 
-    def get(self, model_type: ModelType, limit: int = None, offset: int = None) -> Iterable[Model]:
+    # True if get supports the after argument (keyset pagination), so that views can offer cursors to the next page
+    supports_keyset_pagination = False
+
+    def get(self, model_type: ModelType, limit: int = None, offset: int = None, filters: Optional[Filters] = None,
+            order_by: Optional[str] = None, after: Optional[Tuple[Any, Hashable]] = None) -> Iterable[Model]:
         """
         Base fetch data method for DataAccessors
 
         :param model_type: the class of the model whose data is being fetched
         :param limit: if informed, limits the quantity of objects to fetch
         :param offset: offset value. If informed, start fetching data from this position
+        :param filters: if informed, only objects whose fields values are among the values of every filter are fetched.
+         DataAccessors that don't support a filter should raise UnsupportedQuery
+        :param order_by: if informed, name of the field to order objects by, with a '-' prefix for descending order.
+         DataAccessors that don't support ordering should raise UnsupportedQuery
+        :param after: if informed, (order_by field value, key) of the object after which objects are fetched (keyset
+         pagination). If order_by is None, only the key is used. DataAccessors that don't support it should raise
+         UnsupportedQuery
         :return: list (or other type of iterable) of models of type model_type
         """
 
         raise NotImplementedError
 
+    @staticmethod
+    def _check_filters(model_type: ModelType, filters: Optional[Filters], order_by: Optional[str] = None) -> None:
+        """Raises UnsupportedQuery if any of the filters, or the order_by field, is not a field of model_type"""
+
+        for field_name in [*(filters or ()), *([order_by.lstrip('-')] if order_by else [])]:
+            if field_name not in model_type._get_fields():
+                raise DataAccessor.UnsupportedQuery(f"'{field_name}' is not a field of {model_type.__name__}")
+
     def get_by_keys(self, model_type: ModelType, *keys: Hashable) -> Iterable[Model]:
         """
         Base fetch data by ids method for DataAccessors
@@ -39,3 +62,7 @@ class DataAccessor:
 
         results = self.get_by_keys(model_type, key)
         return results[0] if results else None
+
+    class UnsupportedQuery(ModelException):
+        """Custom exception to signal that a DataAccessor can't fetch data with the requested filters"""
+        pass
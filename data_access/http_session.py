@@ -0,0 +1,131 @@
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from typing import Optional, Tuple, Union, Dict
+from threading import Lock, local
+
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+class ConnectionStats:
+    """
+    Thread safe counters of the connections used by a PooledHttpSession. Every request checks out a connection from
+    the pool: it is either a reused keep-alive connection, or a new one that has to be opened (TCP + TLS handshake)
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def _count_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reused_connections(self) -> int:
+        """Quantity of requests that were sent through an already open connection"""
+        return max(self.requests - self.new_connections, 0)
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': max(self.requests - self.new_connections, 0),
+            }
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose urllib3 connection pools report every connection checkout and every new connection to a
+    ConnectionStats object
+    """
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        stats = self._stats
+
+        def counting_pool_class(pool_class):
+            class CountingPool(pool_class):
+                def _get_conn(self, *a, **kw):
+                    stats._count_request()
+                    return super()._get_conn(*a, **kw)
+
+                def _new_conn(self, *a, **kw):
+                    stats._count_new_connection()
+                    return super()._new_conn(*a, **kw)
+
+            CountingPool.__name__ = f'Counting{pool_class.__name__}'
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': counting_pool_class(HTTPConnectionPool),
+            'https': counting_pool_class(HTTPSConnectionPool),
+        }
+
+
+class PooledHttpSession:
+    """
+    Keep-alive HTTP session with a bounded pool of connections per host, to be shared by all threads of a process.
+    requests.Session objects are not guaranteed to be thread safe, so each thread gets its own Session, but all of
+    them share the same connection pools (which are thread safe), so connections are reused across threads.
+    """
+
+    def __init__(self, pool_size: int = 10, max_hosts: int = 10, pool_block: bool = False,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = 30.):
+        """
+        :param pool_size: maximum number of connections kept open to each host
+        :param max_hosts: number of hosts for which a pool of connections is cached
+        :param pool_block: if True, requests wait for a free connection when pool_size connections to a host are
+         already in use. If False, an extra (non pooled) connection is opened instead
+        :param connect_timeout: timeout in seconds to establish a connection. Can be None (no timeout)
+        :param read_timeout: timeout in seconds to wait for the server response once connected. Can be None
+        """
+
+        self.stats = ConnectionStats()
+        self.timeout: Timeout = (connect_timeout, read_timeout)
+        self._adapter = _CountingHTTPAdapter(
+            self.stats,
+            pool_connections=max_hosts,
+            pool_maxsize=pool_size,
+            pool_block=pool_block,
+        )
+        self._local = local()
+
+    @property
+    def session(self) -> Session:
+        """Returns current thread's Session, creating it on first access"""
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = Session()
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, timeout: Timeout = None, **kwargs) -> Response:
+        """
+        Sends a GET request through the pooled connections
+
+        :param url: send request to this url
+        :param timeout: overrides the session's (connect, read) timeouts for this request
+        :param kwargs: any other kwargs accepted by requests.Session.get
+        :return: requests' Response object
+        """
+
+        return self.session.get(url, timeout=timeout if timeout is not None else self.timeout, **kwargs)
+
+    def close(self) -> None:
+        """Closes all pooled connections"""
+        self._adapter.close()
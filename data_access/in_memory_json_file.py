@@ -1,64 +1,172 @@
-from data_access.data_accesor import DataAccessor, Model, ModelType
-from typing import List, Hashable, Dict
-import json
+from data_access.data_accesor import DataAccessor, Model, ModelType, Filters
+from data_access.snapshot import DataSnapshot, pin_snapshot
+from data_access.binary_snapshot import read_snapshot, SnapshotData
+from typing import List, Hashable, Optional, Tuple, Any, Dict
+from threading import Lock, Thread, Event
+import codec
+import os
 
 
 class InMemoryJsonFileDataAccessor(DataAccessor):
     """
     InMemoryJsonFileDataAccessor retrieves data from a json file with an array of objects of the type of the associated
     model. Receives the file_path on the __init__ method to read data from said file on instantiation.
+    If a snapshot_path is informed, data is loaded from that binary snapshot (see data_access.binary_snapshot) instead,
+    unless it is missing or stale (compiled before the last change of the json file).
+    If a reload_interval is informed, a background thread checks every reload_interval seconds whether the file was
+    modified or replaced, and if so parses it again and swaps the new data in a single assignment, so requests never
+    pay the parse cost. Inside a consistent_snapshots context (every view run by views.default_view_function is), all
+    the calls keep using the data of the first one, so a request expanding related objects never sees data from before
+    and after a reload. If the new file is invalid (i.e. while it is being written), the previous data keeps being
+    served
     """
 
-    def __init__(self, file_path: str):
+    supports_keyset_pagination = True
+
+    def __init__(self, file_path: str, snapshot_path: str = None, key: str = 'id', reload_interval: float = None):
         """
-        Init method. Reads data from target Json file and stores it in memory in _raw_data attribute. It initializes the
-        _data attribute with value None, it will be used later to hold the data by id and converted to the target model
-        type
+        Init method. Reads data from the binary snapshot (if valid) or else from target Json file and stores it in
+        memory, in _raw_columns or _raw_data attribute respectively. It initializes the _data attribute with value None,
+        it will be used later to hold the data by id and converted to the target model type
 
         :param file_path: Path to the json file holding the data
+        :param snapshot_path: Path to a binary snapshot compiled from file_path. If None, file_path is always read
+        :param key: name of the key field of the model whose data is held, the snapshot should be indexed by
+        :param reload_interval: seconds between checks of changes of the json file. If None or 0, the file is only read
+         once (reload can still be called explicitly)
         """
 
-        with open(file_path, 'r') as f:
-            self._raw_data = json.load(f)
-        self._data = None
-
-    def _get_data(self, model_type: ModelType) -> Dict[Hashable, Model]:
+        self._file_path = file_path
+        self._snapshot_path = snapshot_path
+        self._key = key
+        self._signature = self._file_signature()
+        self._raw_columns, self._raw_data = self._read()
+        self._from_snapshot = self._raw_columns is not None
+        self._data: Optional[DataSnapshot] = None
+        self._model_type: Optional[ModelType] = None
+        self._lock = Lock()
+        self._reload_lock = Lock()
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+        self._stop = Event()
+        if reload_interval:
+            Thread(target=self._reload_loop, args=(reload_interval,), name='json-file-reload', daemon=True).start()
+
+    @property
+    def from_snapshot(self) -> bool:
+        """True if data was last loaded from a binary snapshot instead of the json file"""
+
+        return self._from_snapshot
+
+    def _file_signature(self) -> Tuple[int, int, int]:
+        """Internal method that returns the inode, size and modification time of the json file, to detect changes"""
+
+        stat = os.stat(self._file_path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _read(self) -> Tuple[Optional[SnapshotData], Optional[List[Dict[str, Any]]]]:
+        """Internal method that reads the data of the binary snapshot, if valid, or else the rows of the json file"""
+
+        columns = read_snapshot(self._snapshot_path, self._file_path, key=self._key) if self._snapshot_path else None
+        if columns is not None:
+            return columns, None
+        with open(self._file_path, 'rb') as f:
+            return None, codec.load(f)
+
+    @staticmethod
+    def _build(model_type: ModelType, columns: Optional[SnapshotData],
+               rows: Optional[List[Dict[str, Any]]]) -> DataSnapshot:
+        if columns is None:
+            return DataSnapshot(model_type.from_rows(rows))
+        return DataSnapshot(model_type.from_columns(columns.columns), key_order=columns.key_order)
+
+    def _get_data(self, model_type: ModelType) -> DataSnapshot:
         """
-        Internal method to transform _raw_data values into _data dict that holds data formatted as target model type.
-        If _data is None (first data access), it transforms the _raw_data into _data dict and deletes _raw_data from
-        memory
+        Internal method to transform _raw_data values into _data snapshot that holds data formatted as target model
+        type, indexed by key. If _data is None (first data access), it transforms the _raw_data (or the _raw_columns of
+        the snapshot) into _data and deletes them from memory. model_type is kept to build the snapshot of reloaded
+        data. Inside a consistent_snapshots context, the snapshot first returned in it is returned instead
 
         :param model_type: the class of the model whose data is being accessed
-        :return: dict with models keys as keys, and models of type model_type as values
+        :return: DataSnapshot with models of type model_type
         """
         if self._data is None:
-            self._data = {d[model_type.key_field_name()]: model_type(**d) for d in self._raw_data}
-            del self._raw_data
-        return self._data
-
-    def _get_data_as_list(self, model_type: ModelType) -> List[Model]:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._build(model_type, self._raw_columns, self._raw_data)
+                    self._model_type = model_type
+                    self._raw_columns = self._raw_data = None
+        return pin_snapshot(self, self._data)
+
+    def reload(self) -> bool:
         """
-        Internal method that returns all models in List form, form _data attribute (they are stored as a dict)
+        Reads the json file again (or its snapshot, if valid) if it was modified or replaced since it was last read,
+        and swaps the new data in. The file is read and parsed before taking the lock that guards the data, so requests
+        accessing it meanwhile are not blocked. Reloads are serialized, so explicit calls and the background thread
+        never swap in data older than the one already loaded. Errors are not raised: they are counted in failed_reloads
+        and recorded in last_error, the previous data keeps being served and the file is read again on next call
 
-        :param model_type: the class of the model whose data is being accessed
-        :return: list with models of type model_type
+        :return: True if new data was swapped in
         """
 
-        return list(self._get_data(model_type).values())
-
-    def get(self, model_type: ModelType, limit: int = None, offset: int = None) -> List[Model]:
+        with self._reload_lock:
+            try:
+                signature = self._file_signature()
+                if signature == self._signature:
+                    return False
+                # The file is read and parsed without holding _lock, so first accesses are not blocked meanwhile
+                columns, rows = self._read()
+                data = None
+                while True:
+                    model_type = self._model_type
+                    if model_type is not None and data is None:
+                        data = self._build(model_type, columns, rows)
+                    with self._lock:
+                        if self._model_type is None:
+                            # Not accessed yet: data is converted to models on first access
+                            self._raw_columns, self._raw_data = columns, rows
+                            break
+                        if data is not None:
+                            self._data = data
+                            break
+                    # First accessed while reading the file: data is converted to models before swapping it in
+            except Exception as e:
+                self.failed_reloads += 1
+                self.last_error = f'{e.__class__.__name__}: {str(e)}'
+                return False
+            self._signature = signature
+            self._from_snapshot = columns is not None
+            self.reloads += 1
+            self.last_error = None
+            return True
+
+    def _reload_loop(self, reload_interval: float) -> None:
+        while not self._stop.wait(reload_interval):
+            self.reload()
+
+    def close(self) -> None:
+        """Stops the background reload thread"""
+
+        self._stop.set()
+
+    def get(self, model_type: ModelType, limit: int = None, offset: int = None, filters: Optional[Filters] = None,
+            order_by: Optional[str] = None, after: Optional[Tuple[Any, Hashable]] = None) -> List[Model]:
         """
         Fetches data from memory
 
         :param model_type: the class of the model whose data is being fetched
         :param limit: limits the number of objects to fetch. For this accessor, this is mandatory and should be >= 1.
         :param offset: offset value. If informed, start fetching data from this position
+        :param filters: if informed, only objects whose fields values are among the values of every filter are fetched
+        :param order_by: if informed, name of the field to order objects by, with a '-' prefix for descending order
+        :param after: if informed, (order_by field value, key) of the object after which objects are fetched. offset is
+         then ignored
         :return: list of models of type model_type
         """
 
-        off = offset if offset and offset > 0 else 0
-        lim = (off + limit) if limit else None
-        return self._get_data_as_list(model_type)[off:lim]
+        self._check_filters(model_type, filters, order_by)
+        return self._get_data(model_type).slice(limit, offset, filters, order_by, after)
 
     def get_by_keys(self, model_type: ModelType, *keys: Hashable) -> List[Model]:
         """
@@ -69,5 +177,4 @@ class InMemoryJsonFileDataAccessor(DataAccessor):
         :return: list of models of type model_type
         """
 
-        data_by_key = self._get_data(model_type)
-        return [data_by_key[k] for k in keys if k in data_by_key]
+        return self._get_data(model_type).get_by_keys(*keys)
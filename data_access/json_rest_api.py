@@ -1,7 +1,42 @@
-from data_access.data_accesor import DataAccessor, Model, ModelType
-from typing import List, Hashable, Dict, Optional
-from requests import get, ConnectTimeout, ConnectionError
-import json
+from data_access.data_accesor import DataAccessor, Model, ModelType, Filters
+from typing import List, Hashable, Dict, Optional, Tuple, Iterable, Any
+from data_access.http_session import PooledHttpSession
+from data_access.single_flight import SingleFlight
+from data_access.circuit_breaker import CircuitBreaker
+from data_access.latency import LatencyWindow
+from models import BoundedExecutor
+from requests import ConnectTimeout, ConnectionError, RequestException
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Lock
+from functools import partial
+from random import uniform
+from urllib.parse import urlencode
+from time import sleep, perf_counter
+import codec
+
+
+class RequestStats:
+    """Thread safe counters of the requests sent by a JsonRestApiDataAccessor, and of its retries and hedges"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.fetches = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _count(self, fetches: int = 0, retries: int = 0, hedges: int = 0, hedge_wins: int = 0) -> None:
+        with self._lock:
+            self.fetches += fetches
+            self.retries += retries
+            self.hedges += hedges
+            self.hedge_wins += hedge_wins
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'fetches': self.fetches, 'retries': self.retries, 'hedges': self.hedges, 'hedge_wins': self.hedge_wins
+            }
 
 
 class JsonRestApiDataAccessor(DataAccessor):
@@ -11,16 +46,182 @@ class JsonRestApiDataAccessor(DataAccessor):
     ot list several specific objects by informing their ids (allowing more than on eid per request).
     """
 
-    def __init__(self, endpoint: str, timeout: Optional[float] = 30.):
+    def __init__(self, endpoint: str, timeout: Optional[float] = 30., connect_timeout: Optional[float] = None,
+                 pool_size: int = 10, session: PooledHttpSession = None, coalesce_requests: bool = True,
+                 max_keys_per_request: int = 100, max_url_length: int = 2000, max_workers: int = 4,
+                 page_size: Optional[int] = None, circuit_failure_threshold: Optional[int] = 5,
+                 circuit_reset_timeout: float = 30., retries: int = 1, retry_backoff: float = .05,
+                 hedge_percentile: Optional[float] = None, filterable_fields: Iterable[str] = ()):
         """
         :param endpoint: url of endpoint from which data should be requested
         :param timeout: optional argument with timeout time in seconds for get requests (default is 30.). Can be None.
+         If connect_timeout is informed, this is only used as the timeout to read the response
+        :param connect_timeout: optional argument with timeout time in seconds to establish a connection. If None,
+         timeout is used
+        :param pool_size: maximum number of keep-alive connections to the endpoint's host shared by all threads
+        :param session: optional PooledHttpSession to use (it can be shared by several accessors). If informed,
+         timeout, connect_timeout and pool_size args are ignored
+        :param coalesce_requests: if True, concurrent requests for the same url (same page, or same set of keys) share
+         a single request to the API and its parsed result
+        :param max_keys_per_request: maximum quantity of keys requested per request by get_by_keys. More keys are split
+         into several requests (chunks), sent concurrently
+        :param max_url_length: maximum length in bytes of the urls requested by get_by_keys. Keys whose url would exceed
+         it are split into several requests (chunks), sent concurrently
+        :param max_workers: maximum quantity of concurrent requests sent by a single get or get_by_keys call
+        :param page_size: maximum quantity of objects the API returns per request. get calls with a greater limit are
+         split into several page requests, sent concurrently. If None, the limit is always requested at once
+        :param circuit_failure_threshold: quantity of consecutive failed requests (errors, timeouts or non 200 status
+         codes other than 4xx, once retried) after which requests fail fast, without being sent, for
+         circuit_reset_timeout seconds (see CircuitBreaker). If None or 0, requests are always sent
+        :param circuit_reset_timeout: seconds during which requests fail fast, before sending a trial request
+        :param retries: quantity of times a failed request (connection errors, timeouts and 429 or 5xx status codes) is
+         sent again. Retries wait a random time (jitter) of up to retry_backoff seconds, doubled on each retry
+        :param retry_backoff: maximum wait in seconds before the first retry
+        :param hedge_percentile: if informed, when a request takes longer than this percentile of the latest requests
+         latencies, a duplicate (hedge) request is sent, and the first response of both is used
+        :param filterable_fields: names of the fields the API can filter by, with query params named after them (i.e.
+         ?department=5&department=6). Filtering by other fields raises DataAccessor.UnsupportedQuery
         """
 
         self._endpoint = endpoint
-        self._timeout = timeout
+        self._session = session or PooledHttpSession(
+            pool_size=pool_size,
+            connect_timeout=connect_timeout if connect_timeout is not None else timeout,
+            read_timeout=timeout,
+        )
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self._max_keys_per_request = max(max_keys_per_request, 1)
+        self._max_url_length = max_url_length
+        self._executor = BoundedExecutor(max_workers) if max_workers > 1 else None
+        self._page_size = page_size if page_size and page_size > 0 else None
+        self._circuit_breaker = CircuitBreaker(
+            circuit_failure_threshold, circuit_reset_timeout, is_failure=self._is_service_failure
+        ) if circuit_failure_threshold else None
+        self._retries = max(retries, 0)
+        self._retry_backoff = retry_backoff
+        self._hedge_percentile = hedge_percentile
+        self._latencies = LatencyWindow()
+        self._hedge_executor = ThreadPoolExecutor(max_workers=2 * pool_size, thread_name_prefix='hedged-requests') \
+            if hedge_percentile else None
+        self._request_stats = RequestStats()
+        self._filterable_fields = frozenset(filterable_fields)
+
+    @property
+    def connection_stats(self) -> Dict[str, int]:
+        """Returns counters of requests sent, and of new vs reused connections used to send them"""
+        return self._session.stats.to_dict()
+
+    @property
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Returns counters of requests, and of requests that shared the result of an identical request in flight"""
+        return self._single_flight.to_dict() if self._single_flight else {'calls': 0, 'shared_calls': 0}
+
+    @property
+    def circuit_breaker_stats(self) -> Dict[str, Any]:
+        """Returns circuit breaker's state and counters"""
+        return self._circuit_breaker.to_dict() if self._circuit_breaker else {'state': CircuitBreaker.CLOSED}
+
+    @property
+    def request_stats(self) -> Dict[str, int]:
+        """Returns counters of fetches of urls, and of the retries and hedge requests sent for them"""
+        return self._request_stats.to_dict()
 
     def _get(self, url: str) -> List[Dict]:
+        """
+        Internal method to fetch data from target API and return json parsed. If coalesce_requests is enabled,
+        concurrent calls for the same url share the same request and result, so the result should not be modified
+
+        :param url: send request to this url
+        :return: list of raw data in python dicts
+        """
+
+        if self._single_flight is None:
+            return self._fetch(url)
+        return self._single_flight.do(url, partial(self._fetch, url))
+
+    @staticmethod
+    def _is_service_failure(error: BaseException) -> bool:
+        """Client errors (4xx status codes) are responses to invalid requests, not failures of the API"""
+        return not isinstance(error, JsonRestApiDataAccessor.HttpStatusError) or not 400 <= error.status_code < 500
+
+    @staticmethod
+    def _is_retryable(error: BaseException) -> bool:
+        if isinstance(error, JsonRestApiDataAccessor.HttpStatusError):
+            return error.status_code == 429 or error.status_code >= 500
+        return isinstance(error, RequestException)
+
+    def _fetch(self, url: str) -> List[Dict]:
+        """
+        Internal method to fetch data from target API through the circuit breaker (if enabled), retrying failed
+        requests. Only the outcome of the fetch, after its retries, counts as a success or failure for the breaker, and
+        if the breaker is open a CircuitBreaker.OpenError is raised without sending any request
+
+        :param url: send request to this url
+        :return: list of raw data in python dicts
+        """
+
+        self._request_stats._count(fetches=1)
+        if self._circuit_breaker is None:
+            return self._retrying_request(url)
+        return self._circuit_breaker.call(partial(self._retrying_request, url))
+
+    def _retrying_request(self, url: str) -> List[Dict]:
+        """
+        Internal method to send a request to target API, retrying failed requests (see retries) with jittered
+        exponential backoff
+
+        :param url: send request to this url
+        :return: list of raw data in python dicts
+        """
+
+        for attempt in range(self._retries + 1):
+            try:
+                return self._hedged_request(url)
+            except Exception as e:
+                if attempt == self._retries or not self._is_retryable(e):
+                    raise
+            self._request_stats._count(retries=1)
+            sleep(uniform(0, self._retry_backoff * 2 ** attempt))
+
+    def _hedged_request(self, url: str) -> List[Dict]:
+        """
+        Internal method to send a request and, if it takes longer than the hedge_percentile of latencies, a duplicate
+        one, returning the first successful response. If both fail, the error of the first request is raised
+
+        :param url: send request to this url
+        :return: list of raw data in python dicts
+        """
+
+        delay = self._latencies.percentile(self._hedge_percentile) if self._hedge_executor else None
+        if delay is None:
+            return self._timed_request(url)
+
+        first = self._hedge_executor.submit(self._timed_request, url)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        self._request_stats._count(hedges=1)
+        hedge = self._hedge_executor.submit(self._timed_request, url)
+        pending = {first, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._request_stats._count(hedge_wins=1)
+                    return future.result()
+        return first.result()
+
+    def _timed_request(self, url: str) -> List[Dict]:
+        """Internal method to send a request, recording its latency"""
+
+        start = perf_counter()
+        result = self._request(url)
+        self._latencies.record(perf_counter() - start)
+        return result
+
+    def _request(self, url: str) -> List[Dict]:
         """
         Internal method to fetch data from target API and return json parsed. Returns error if get requests' status
         code is != 200
@@ -30,22 +231,52 @@ class JsonRestApiDataAccessor(DataAccessor):
         """
 
         try:
-            response = get(url, timeout=self._timeout)
+            response = self._session.get(url)
             if response.status_code != 200:
-                raise ValueError(f'Error fetching data: {response.status_code} - {str(response.content or "")}')
-            return json.loads(response.content)
+                raise JsonRestApiDataAccessor.HttpStatusError(
+                    response.status_code, f'Error fetching data: {response.status_code} - {str(response.content or "")}'
+                )
+            return codec.loads(response.content)
         except ConnectTimeout:
             raise ConnectTimeout('Error fetching data: Connection timeout')
         except ConnectionError as e:
             raise ConnectionError(f'Error fetching data: Unexpected connection error: {str(e)}')
 
-    def get(self, model_type: ModelType, limit: int = None, offset: int = None) -> List[Model]:
+    def _get_page_url(self, limit: int, offset: Optional[int], filters_query: str = '') -> str:
+        return f'{self._endpoint}?limit={limit}{f"&offset={offset}" if offset is not None else ""}{filters_query}'
+
+    def _get_filters_query(self, model_type: ModelType, filters: Optional[Filters]) -> str:
+        """
+        Internal method that returns the query params to push filters down to the API (starting with '&'), raising
+        UnsupportedQuery if the API can't filter by any of them, or by null values
+        """
+
+        self._check_filters(model_type, filters)
+        if not filters:
+            return ''
+        unsupported = sorted(set(filters) - self._filterable_fields)
+        if unsupported:
+            raise DataAccessor.UnsupportedQuery(f'Filtering by {", ".join(unsupported)} is not supported')
+        # The API has no syntax to filter by null values
+        null_filters = sorted(field_name for field_name, values in filters.items() if None in values)
+        if null_filters:
+            raise DataAccessor.UnsupportedQuery(f'Filtering by null {", ".join(null_filters)} is not supported')
+        return '&' + urlencode([(field_name, v) for field_name, values in sorted(filters.items()) for v in values])
+
+    def get(self, model_type: ModelType, limit: int = None, offset: int = None, filters: Optional[Filters] = None,
+            order_by: Optional[str] = None, after: Optional[Tuple[Any, Hashable]] = None) -> List[Model]:
         """
-        Fetches data from API
+        Fetches data from API. If limit is greater than page_size, the objects are requested in several pages, sent
+        concurrently, and collected in order. No more pages are requested once a page that is not full is received, but
+        up to max_workers - 1 pages after it may already have been requested (their results are discarded)
 
         :param model_type: the class of the model whose data is being fetched
         :param limit: limits the number of objects to fetch. For this accessor, this is mandatory and should be >= 1.
         :param offset: offset value. If informed, start fetching data from this position
+        :param filters: if informed, only objects whose fields values are among the values of every filter are fetched.
+         Filters are sent to the API, so they should be filterable_fields
+        :param order_by: not supported by the API. If informed, UnsupportedQuery is raised
+        :param after: not supported by the API. If informed, UnsupportedQuery is raised
         :return: list of models of type model_type
         """
 
@@ -53,22 +284,109 @@ class JsonRestApiDataAccessor(DataAccessor):
             raise ValueError(f'{self.__class__.__name__} requires limit >= 1 to get data')
         if offset and offset < 0:
             raise ValueError(f'{self.__class__.__name__} requires offset None or >= 0 to get data')
+        if order_by or after is not None:
+            raise DataAccessor.UnsupportedQuery('Ordering and cursor pagination are not supported')
+        filters_query = self._get_filters_query(model_type, filters)
+
+        if not self._page_size or limit <= self._page_size:
+            return model_type.from_rows(self._get(self._get_page_url(limit, offset, filters_query)))
 
-        return [
-            model_type(**obj) for obj
-            in self._get(f'{self._endpoint}?limit={limit}{f"&offset={offset}" if offset is not None else ""}')
+        start = offset or 0
+        fetches = [
+            partial(self._get, self._get_page_url(
+                min(self._page_size, start + limit - page_offset), page_offset, filters_query
+            ))
+            for page_offset in range(start, start + limit, self._page_size)
         ]
+        pages = self._executor.iter_results(fetches) if self._executor else (fetch() for fetch in fetches)
+        objects = []
+        for rows in pages:
+            objects.extend(model_type.from_rows(rows))
+            if len(rows) < self._page_size:
+                # Last page with data, remaining pages (if any) are empty
+                break
+        return objects
+
+    def _get_keys_urls(self, keys: Tuple[Hashable, ...]) -> List[Tuple[List[Hashable], str]]:
+        """
+        Internal method that splits keys into chunks of at most max_keys_per_request keys, and whose url doesn't exceed
+        max_url_length bytes (unless a single key exceeds it). Keys are deduplicated and sorted so that the same set of
+        keys always produces the same urls, allowing concurrent requests for them to be coalesced
+
+        :param keys: keys to fetch
+        :return: list of chunks of keys, with the url to fetch each chunk
+        """
+
+        base_url = f'{self._endpoint}?'
+        chunks = []
+        chunk_keys, chunk_params = [], []
+        # Length of the url, minus the '&' separator of the first param
+        url_length = len(base_url.encode()) - 1
+        for k in sorted(set(keys), key=str):
+            param = f'id={k}'
+            if chunk_keys and (len(chunk_keys) >= self._max_keys_per_request or
+                               url_length + len(param.encode()) + 1 > self._max_url_length):
+                chunks.append((chunk_keys, f'{base_url}{"&".join(chunk_params)}'))
+                chunk_keys, chunk_params = [], []
+                url_length = len(base_url.encode()) - 1
+            chunk_keys.append(k)
+            chunk_params.append(param)
+            url_length += len(param.encode()) + 1
+        if chunk_keys:
+            chunks.append((chunk_keys, f'{base_url}{"&".join(chunk_params)}'))
+        return chunks
 
     def get_by_keys(self, model_type: ModelType, *keys: Hashable) -> List[Model]:
         """
-        Fetch data from API, by object keys
+        Fetch data from API, by object keys. Keys are split into chunks (see max_keys_per_request and max_url_length)
+        that are requested concurrently. If any chunk fails, a ChunkedFetchError is raised, reporting the error of each
+        failed chunk
 
         :param model_type: the class of the model whose data is being fetched
         :param keys: inform 0 to n keys to fetch data from related objects
         :return: list of models of type model_type
         """
 
-        return [
-            model_type(**obj) for obj
-            in self._get(f'{self._endpoint}?{"&".join([f"id={k}" for k in keys])}')
-        ]
+        chunks = self._get_keys_urls(keys)
+        if not chunks:
+            return []
+        if len(chunks) == 1:
+            return model_type.from_rows(self._get(chunks[0][1]))
+
+        fetches = [partial(self._get, url) for _, url in chunks]
+        results = self._executor.run_all(fetches, return_exceptions=True) if self._executor else \
+            [self._run_returning_exception(fetch) for fetch in fetches]
+
+        errors = [(chunk_keys, r) for (chunk_keys, _), r in zip(chunks, results) if isinstance(r, Exception)]
+        if errors:
+            raise JsonRestApiDataAccessor.ChunkedFetchError(errors, total_chunks=len(chunks))
+        return model_type.from_rows([row for rows in results for row in rows])
+
+    @staticmethod
+    def _run_returning_exception(fn):
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    class HttpStatusError(ValueError):
+        """Custom exception to signal that the API responded with an error status code, held in status_code attribute"""
+
+        def __init__(self, status_code: int, message: str):
+            self.status_code = status_code
+            super().__init__(message)
+
+    class ChunkedFetchError(Exception):
+        """
+        Custom exception to signal that some of the chunks of keys requested by get_by_keys failed. Its errors attribute
+        holds the keys of each failed chunk, and the exception raised when fetching it
+        """
+
+        def __init__(self, errors: List[Tuple[List[Hashable], Exception]], total_chunks: int):
+            self.errors = errors
+            self.total_chunks = total_chunks
+            super().__init__(
+                f'Error fetching data: {len(errors)} of {total_chunks} requests failed: ' + '; '.join(
+                    f'keys {chunk_keys[0]}..{chunk_keys[-1]} ({len(chunk_keys)}): {e}' for chunk_keys, e in errors
+                )
+            )
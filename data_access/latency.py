@@ -0,0 +1,38 @@
+from collections import deque
+from typing import Optional
+from threading import Lock
+
+
+class LatencyWindow:
+    """Thread safe rolling window with the latencies of the last size requests, to compute their percentiles"""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        """
+        :param size: quantity of latest latencies kept
+        :param min_samples: minimum quantity of latencies recorded to compute percentiles
+        """
+
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=size)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Returns the latency (in seconds) below which are the informed percentile of recorded latencies, or None if less
+        than min_samples latencies were recorded
+
+        :param percentile: percentile, between 0 and 100
+        """
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)]
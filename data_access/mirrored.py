@@ -0,0 +1,176 @@
+from data_access.data_accesor import DataAccessor, Model, ModelType, Filters
+from data_access.snapshot import DataSnapshot
+from typing import List, Hashable, Dict, Optional, Any, Tuple
+from threading import Lock, Thread, Event
+from time import time
+
+
+class MirrorStats:
+    """Refresh counters and state of the mirror of a model"""
+
+    def __init__(self):
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.reused_objects = 0
+        self.refreshed_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'refreshes': self.refreshes,
+            'failed_refreshes': self.failed_refreshes,
+            'reused_objects': self.reused_objects,
+            'refreshed_at': self.refreshed_at,
+            'last_error': self.last_error,
+        }
+
+
+class MirroredDataAccessor(DataAccessor):
+    """
+    MirroredDataAccessor keeps a local copy of all the data of another DataAccessor (i.e. a JsonRestApiDataAccessor),
+    and serves every get and get_by_keys call from it, without sending any request to the mirrored source. The copy of
+    a model is loaded paging through source's get the first time it is accessed (or when load is called), and then
+    refreshed in a background thread every refresh_interval seconds. If a refresh fails (i.e. the source is down), the
+    previous copy keeps being served.
+    """
+
+    supports_keyset_pagination = True
+
+    def __init__(self, source: DataAccessor, page_size: int = 1000, refresh_interval: Optional[float] = 300.):
+        """
+        :param source: DataAccessor whose data is mirrored. Its get method should support limit and offset
+        :param page_size: quantity of objects fetched per source's get call while loading or refreshing the data
+        :param refresh_interval: seconds between background refreshes of the data. If None or 0, data is never
+         refreshed in background (refresh can still be called explicitly)
+        """
+
+        if page_size < 1:
+            raise ValueError('page_size should be >= 1')
+        self._source = source
+        self._page_size = page_size
+        self._refresh_interval = refresh_interval
+        self._snapshots: Dict[ModelType, DataSnapshot] = {}
+        self._stats: Dict[ModelType, MirrorStats] = {}
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def mirror_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns size and refresh counters of the mirror of each loaded model"""
+
+        return {
+            model_type.__name__: {'size': len(self._snapshots[model_type]), **stats.to_dict()}
+            for model_type, stats in list(self._stats.items())
+        }
+
+    def _fetch_all(self, model_type: ModelType, previous: Optional[DataSnapshot]) -> Tuple[DataSnapshot, int]:
+        """
+        Internal method that pages through source's data until it returns an empty page, building a new snapshot.
+        Objects whose fields are unchanged from the previous snapshot are reused, so unchanged data doesn't take new
+        memory
+
+        :return: the new snapshot, and the quantity of objects reused from the previous one
+        """
+
+        field_names = list(model_type._get_fields())
+        previous_by_key = previous.by_key if previous else {}
+        objects = []
+        reused = 0
+        offset = 0
+        while True:
+            page = list(self._source.get(model_type, limit=self._page_size, offset=offset))
+            for o in page:
+                old = previous_by_key.get(o.key)
+                if old is not None and all(getattr(old, f) == getattr(o, f) for f in field_names):
+                    o = old
+                    reused += 1
+                objects.append(o)
+            # The source may return less objects than requested per page (i.e. if it caps its page size), so only an
+            #  empty page means that there is no more data
+            if not page:
+                return DataSnapshot(objects), reused
+            offset += len(page)
+
+    def load(self, model_type: ModelType) -> DataSnapshot:
+        """
+        Loads model_type's data from the source, if not loaded yet, and starts the background refresh thread. Can be
+        called at startup to avoid loading the data during the first request that needs it
+
+        :param model_type: the class of the model whose data is loaded
+        :return: the snapshot with model_type's data
+        """
+
+        snapshot = self._snapshots.get(model_type)
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshots.get(model_type)
+            if snapshot is None:
+                snapshot, _ = self._fetch_all(model_type, None)
+                self._stats[model_type] = MirrorStats()
+                self._stats[model_type].refreshed_at = time()
+                self._snapshots[model_type] = snapshot
+                if self._refresh_interval and self._thread is None:
+                    self._thread = Thread(target=self._refresh_loop, name='mirror-refresh', daemon=True)
+                    self._thread.start()
+        return snapshot
+
+    def refresh(self, model_type: ModelType = None) -> None:
+        """
+        Fetches again the data of model_type (of every loaded model, if None) and swaps it in. Errors are not raised:
+        they are recorded in mirror_stats, and the previous data keeps being served
+        """
+
+        for mt in [model_type] if model_type else list(self._snapshots):
+            stats = self._stats.setdefault(mt, MirrorStats())
+            try:
+                snapshot, reused = self._fetch_all(mt, self._snapshots.get(mt))
+            except Exception as e:
+                stats.failed_refreshes += 1
+                stats.last_error = f'{e.__class__.__name__}: {str(e)}'
+                continue
+            self._snapshots[mt] = snapshot
+            stats.refreshes += 1
+            stats.reused_objects = reused
+            stats.refreshed_at = time()
+            stats.last_error = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self._refresh_interval):
+            self.refresh()
+
+    def close(self) -> None:
+        """Stops the background refresh thread"""
+
+        self._stop.set()
+
+    def get(self, model_type: ModelType, limit: int = None, offset: int = None, filters: Optional[Filters] = None,
+            order_by: Optional[str] = None, after: Optional[Tuple[Any, Hashable]] = None) -> List[Model]:
+        """
+        Fetches data from the local copy of the source's data
+
+        :param model_type: the class of the model whose data is being fetched
+        :param limit: if informed, limits the quantity of objects to fetch
+        :param offset: offset value. If informed, start fetching data from this position
+        :param filters: if informed, only objects whose fields values are among the values of every filter are fetched
+        :param order_by: if informed, name of the field to order objects by, with a '-' prefix for descending order
+        :param after: if informed, (order_by field value, key) of the object after which objects are fetched. offset is
+         then ignored
+        :return: list of models of type model_type
+        """
+
+        self._check_filters(model_type, filters, order_by)
+        return self.load(model_type).slice(limit, offset, filters, order_by, after)
+
+    def get_by_keys(self, model_type: ModelType, *keys: Hashable) -> List[Model]:
+        """
+        Fetches data by object keys from the local copy of the source's data
+
+        :param model_type: the class of the model whose data is being fetched
+        :param keys: inform 0 to n keys to fetch data from related objects
+        :return: list of models of type model_type, in the order of the informed keys
+        """
+
+        return self.load(model_type).get_by_keys(*keys)
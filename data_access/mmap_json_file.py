@@ -0,0 +1,170 @@
+from data_access.data_accesor import DataAccessor, Model, ModelType, Filters
+from typing import List, Hashable, Optional, Tuple, Any, Dict, Union
+from threading import Lock
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import re
+import codec
+
+
+# A JSON string, and a whole JSON object without nested objects (strings may hold any character, including escaped
+#  quotes and braces). Loops are unrolled so that they can't backtrack catastrophically on invalid input
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_FLAT_OBJECT = re.compile(rb'\{[^{}"]*(?:' + _STRING + rb'[^{}"]*)*\}', re.DOTALL)
+# A non empty line of a NDJSON file
+_LINE = re.compile(rb'[^\r\n]+')
+# First non whitespace character of a file, '[' for JSON arrays
+_NON_SPACE = re.compile(rb'\S')
+# Separators allowed between the objects of a JSON array
+_ARRAY_SEPARATORS = frozenset(b' \t\r\n,[]')
+
+
+class _RowsIndex:
+    """
+    Compact index of the rows of a file: start and end offsets of every row, in file order, and their keys. Integer keys
+    are kept sorted in an array (8 bytes per key) and looked up by bisection, other keys in a dict
+    """
+
+    __slots__ = ('starts', 'ends', 'sorted_keys', 'sorted_rows', 'rows_by_key')
+
+    def __init__(self, starts: array, ends: array, keys: List[Hashable]):
+        self.starts = starts
+        self.ends = ends
+        self.sorted_keys: Optional[array] = None
+        self.sorted_rows: Optional[array] = None
+        self.rows_by_key: Optional[Dict[Hashable, int]] = None
+        if all(type(k) is int for k in keys):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self.sorted_keys = array('q', (keys[i] for i in order))
+            self.sorted_rows = array('q', order)
+        else:
+            self.rows_by_key = {}
+            for row, k in enumerate(keys):
+                self.rows_by_key.setdefault(k, row)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def find(self, key: Hashable) -> Optional[int]:
+        """Returns the row (in file order) of the informed key, or None if not found"""
+
+        if self.rows_by_key is not None:
+            return self.rows_by_key.get(key)
+        if type(key) is not int:
+            return None
+        i = bisect_left(self.sorted_keys, key)
+        return self.sorted_rows[i] if i < len(self.sorted_keys) and self.sorted_keys[i] == key else None
+
+
+class MmapJsonFileDataAccessor(DataAccessor):
+    """
+    MmapJsonFileDataAccessor retrieves data from a large file with either a JSON array of objects, or one JSON object
+    per line (NDJSON), without loading it in memory. The file is memory mapped, and the first time it is accessed a
+    compact index with the offsets of every object by key is built in a single pass. Objects are only parsed and turned
+    into models when a request fetches them.
+    Objects of JSON array files should not have nested objects (values can still be arrays of scalars)
+    """
+
+    supports_keyset_pagination = True
+
+    def __init__(self, file_path: str):
+        """
+        Init method. Memory maps the file. The index of the objects is built on first data access, once the model (and
+        its key field) is known
+
+        :param file_path: Path to the JSON array or NDJSON file holding the data
+        """
+
+        self._file_path = file_path
+        with open(file_path, 'rb') as f:
+            # Empty files can't be memory mapped
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+        self._index: Optional[_RowsIndex] = None
+        self._lock = Lock()
+
+    def _is_ndjson(self) -> bool:
+        match = _NON_SPACE.search(self._mmap)
+        return match is None or match.group() != b'['
+
+    def _build_index(self, model_type: ModelType) -> _RowsIndex:
+        """Internal method that scans the whole file once, recording the offsets and key of every object"""
+
+        key_field_name = model_type.key_field_name()
+        key_field = model_type._get_fields()[key_field_name]
+        key_pattern = re.compile(
+            rb'[{,]\s*"' + re.escape(key_field_name.encode()) + rb'"\s*:\s*(' + _STRING + rb'|[^,}\s]+)'
+        )
+        mm = self._mmap
+        ndjson = self._is_ndjson()
+        starts, ends, keys = array('q'), array('q'), []
+        previous_end = 0
+        for match in (_LINE if ndjson else _FLAT_OBJECT).finditer(mm):
+            start, end = match.span()
+            if not ndjson and not _ARRAY_SEPARATORS.issuperset(mm[previous_end:start]):
+                raise ValueError(f'{self._file_path} is not a JSON array of objects without nested objects')
+            previous_end = end
+            key = key_pattern.search(mm, start, end)
+            if key is None:
+                raise ValueError(f"Object at offset {start} of {self._file_path} has no '{key_field_name}' field")
+            starts.append(start)
+            ends.append(end)
+            raw_key = key.group(1)
+            keys.append(key_field.get_value(int(raw_key) if raw_key.isdigit() else codec.loads(raw_key)))
+        if not ndjson and not _ARRAY_SEPARATORS.issuperset(mm[previous_end:]):
+            raise ValueError(f'{self._file_path} is not a JSON array of objects without nested objects')
+        return _RowsIndex(starts, ends, keys)
+
+    def _get_index(self, model_type: ModelType) -> _RowsIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build_index(model_type)
+        return self._index
+
+    def _load_rows(self, index: _RowsIndex, rows: Union[range, List[int]]) -> List[Dict[str, Any]]:
+        mm, starts, ends = self._mmap, index.starts, index.ends
+        return [codec.loads(mm[starts[row]:ends[row]]) for row in rows]
+
+    def get(self, model_type: ModelType, limit: int = None, offset: int = None, filters: Optional[Filters] = None,
+            order_by: Optional[str] = None, after: Optional[Tuple[Any, Hashable]] = None) -> List[Model]:
+        """
+        Fetches data from the file, parsing only the fetched objects
+
+        :param model_type: the class of the model whose data is being fetched
+        :param limit: if informed, limits the quantity of objects to fetch
+        :param offset: offset value. If informed, start fetching data from this position
+        :param filters: not supported. If informed, UnsupportedQuery is raised
+        :param order_by: not supported. If informed, UnsupportedQuery is raised
+        :param after: if informed, (ignored value, key) of the object after which objects are fetched. offset is then
+         ignored
+        :return: list of models of type model_type
+        """
+
+        if filters or order_by:
+            raise DataAccessor.UnsupportedQuery(f'{self.__class__.__name__} does not support filters nor ordering')
+
+        index = self._get_index(model_type)
+        if after is not None:
+            row = index.find(after[1])
+            if row is None:
+                raise DataAccessor.UnsupportedQuery(f'Object {after[1]} to fetch objects after was not found')
+            off = row + 1
+        else:
+            off = offset if offset and offset > 0 else 0
+        rows = range(min(off, len(index)), min(off + limit, len(index)) if limit else len(index))
+        return model_type.from_rows(self._load_rows(index, rows))
+
+    def get_by_keys(self, model_type: ModelType, *keys: Hashable) -> List[Model]:
+        """
+        Fetch data from the file, by object keys
+
+        :param model_type: the class of the model whose data is being fetched
+        :param keys: inform 0 to n keys to fetch data from related objects
+        :return: list of models of type model_type
+        """
+
+        index = self._get_index(model_type)
+        rows = [row for row in map(index.find, keys) if row is not None]
+        return model_type.from_rows(self._load_rows(index, rows))
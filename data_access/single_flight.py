@@ -0,0 +1,64 @@
+from typing import Hashable, Callable, Dict, Any
+from threading import Lock, Event
+
+
+class _Call:
+    """In flight call of a SingleFlight, holding its result or error once done"""
+
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls for the same key: while a call for a key is in flight, any other call for that key
+    waits for it and gets its same result (or error), instead of running again. Once done, the next call for the key
+    runs again. Results are shared between callers, so they should not be modified.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.shared_calls = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Runs fn, unless there is already a call in flight for key, in which case its result is returned once done
+
+        :param key: key that identifies equivalent calls
+        :param fn: function to run
+        :return: fn's result
+        """
+
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            owner = call is None
+            if owner:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared_calls += 1
+
+        if owner:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def to_dict(self) -> Dict[str, int]:
+        """Returns counters of total calls, and of calls that shared the result of a call in flight"""
+        with self._lock:
+            return {'calls': self.calls, 'shared_calls': self.shared_calls}
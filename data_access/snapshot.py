@@ -0,0 +1,229 @@
+from data_access.data_accesor import Filters
+from models import Model
+from typing import List, Hashable, Dict, Iterable, Iterator, Tuple, Optional, Sequence, Any
+from threading import Lock
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Snapshots returned so far inside the current consistent_snapshots context, by data accessor. None outside of it
+_pinned_snapshots = ContextVar('pinned_snapshots', default=None)
+
+
+def _filter_value(value: Any) -> Any:
+    """Returns the value that filters compare with a field value: the key of related objects, or the value itself"""
+    return value.key if isinstance(value, Model) else value
+
+
+def _order_value(obj: Model, field_name: Optional[str]) -> Any:
+    """Returns the value objects are ordered by: the value of field_name, or the object key if None"""
+    return obj.key if field_name is None else getattr(obj, field_name)
+
+
+def _sort_key(value: Any, key: Hashable) -> Tuple:
+    """Returns the key to sort objects by a field value (None values last), with the object key to break ties"""
+    value = _filter_value(value)
+    return value is None, value, key
+
+
+class DataSnapshot:
+    """
+    Immutable set of objects of a model, kept in their original order and indexed by key. Data accessors that hold
+    their data in memory build a new snapshot whenever their data changes and swap it in a single assignment, so any
+    request that already got a snapshot keeps using a consistent version of the data.
+    Filters are resolved with secondary indexes (field value to objects positions), built the first time each field is
+    filtered by, and ordering with sorted indexes, built the first time each field is ordered by. Objects are paged
+    through in key order when no field to order by is informed
+    """
+
+    __slots__ = ('objects', 'by_key', '_indexes', '_sorted_indexes', '_lock')
+
+    def __init__(self, objects: Iterable[Model], key_order: Optional[Sequence[int]] = None):
+        """
+        :param objects: objects of the snapshot, in order. If there are duplicated keys, only the first one is kept
+        :param key_order: optional prebuilt key index (i.e. from a binary snapshot): positions of the objects sorted by
+         key. It is only used if it matches the objects, otherwise the index is built when first needed
+        """
+
+        self.by_key: Dict[Hashable, Model] = {}
+        for o in objects:
+            self.by_key.setdefault(o.key, o)
+        self.objects: Tuple[Model, ...] = tuple(self.by_key.values())
+        self._indexes: Dict[str, Dict[Hashable, List[int]]] = {}
+        self._sorted_indexes: Dict[Optional[str], Tuple[List[Tuple], List[int]]] = {}
+        self._lock = Lock()
+        if key_order is not None and len(key_order) == len(self.objects):
+            self._set_key_order(key_order)
+
+    def _set_key_order(self, key_order: Sequence[int]) -> None:
+        """Internal method that sets the prebuilt key index as sorted index of the keys, if it is actually sorted"""
+
+        try:
+            sort_keys = [_sort_key(self.objects[p].key, self.objects[p].key) for p in key_order]
+            if all(previous < following for previous, following in zip(sort_keys, sort_keys[1:])):
+                self._sorted_indexes[None] = sort_keys, list(key_order)
+        except (IndexError, TypeError):
+            pass
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def _index(self, field_name: str) -> Dict[Hashable, List[int]]:
+        """Returns the index of field_name: a dict with the positions of the objects (in order) by their field value"""
+
+        index = self._indexes.get(field_name)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(field_name)
+                if index is None:
+                    index = {}
+                    for position, o in enumerate(self.objects):
+                        index.setdefault(_filter_value(getattr(o, field_name)), []).append(position)
+                    self._indexes[field_name] = index
+        return index
+
+    def _sorted_index(self, field_name: Optional[str]) -> Tuple[List[Tuple], List[int]]:
+        """
+        Returns the sorted index of field_name (of the objects keys, if None): the sort keys (see _sort_key) of all
+        objects in ascending order, and the positions of the objects in that same order
+        """
+
+        sorted_index = self._sorted_indexes.get(field_name)
+        if sorted_index is None:
+            with self._lock:
+                sorted_index = self._sorted_indexes.get(field_name)
+                if sorted_index is None:
+                    entries = sorted(
+                        (_sort_key(_order_value(o, field_name), o.key), position)
+                        for position, o in enumerate(self.objects)
+                    )
+                    sorted_index = [sort_key for sort_key, _ in entries], [position for _, position in entries]
+                    self._sorted_indexes[field_name] = sorted_index
+        return sorted_index
+
+    def filter(self, filters: Optional[Filters] = None) -> Sequence[Model]:
+        """
+        Returns the objects that match all filters, in order. The positions of the objects that match the most selective
+        filter are taken from its index, and only those objects are checked against the rest of the filters, so the
+        cost depends on the quantity of objects matched rather than on the size of the snapshot
+
+        :param filters: dict of field names and their allowed values. Fields should be fields of the objects' model
+        :return: sequence of objects
+        """
+
+        if not filters:
+            return self.objects
+
+        matches = []
+        for field_name, values in filters.items():
+            index = self._index(field_name)
+            positions = [index.get(v, ()) for v in set(values)]
+            matches.append((sum(len(p) for p in positions), field_name, positions))
+        matches.sort(key=lambda match: match[0])
+
+        _, _, positions = matches[0]
+        positions = positions[0] if len(positions) == 1 else sorted(p for value_positions in positions
+                                                                    for p in value_positions)
+        objects = [self.objects[p] for p in positions]
+        for _, field_name, _ in matches[1:]:
+            values = set(filters[field_name])
+            objects = [o for o in objects if _filter_value(getattr(o, field_name)) in values]
+        return objects
+
+    def slice(self, limit: int = None, offset: int = None, filters: Optional[Filters] = None,
+              order_by: Optional[str] = None, after: Optional[Tuple[Any, Hashable]] = None) -> List[Model]:
+        """
+        Returns at most limit objects (all of them if None) that match filters, starting from offset, or right after the
+        object informed in after (keyset pagination, offset is then ignored). Without filters, objects are taken from
+        the sorted index, so a page costs O(log n + limit) regardless of its position
+
+        :param limit: maximum quantity of objects returned
+        :param offset: quantity of objects skipped
+        :param filters: dict of field names and their allowed values
+        :param order_by: field name to order objects by, with a '-' prefix for descending order (i.e. -first). If None,
+         objects are ordered by key
+        :param after: (order_by field value, key) of the last object of the previous page. If order_by is None, only
+         its key is used
+        :return: list of objects
+        """
+
+        descending = bool(order_by) and order_by.startswith('-')
+        field_name = order_by.lstrip('-') if order_by else None
+
+        if filters:
+            entries = sorted((_sort_key(_order_value(o, field_name), o.key), o) for o in self.filter(filters))
+            sort_keys, items = [sort_key for sort_key, _ in entries], [o for _, o in entries]
+        else:
+            sort_keys, positions = self._sorted_index(field_name)
+            items = _PositionsView(self.objects, positions)
+        # Without order_by, pages continue right after the key of the last object of the previous page, even if that
+        #  object was removed since
+        after_key = None if after is None else _sort_key(after[1] if field_name is None else after[0], after[1])
+
+        if after_key is None:
+            off = offset if offset and offset > 0 else 0
+            start, end = (max(len(items) - off - limit, 0) if limit else 0, len(items) - off) if descending else \
+                (off, (off + limit) if limit else len(items))
+        elif descending:
+            end = bisect_left(sort_keys, after_key)
+            start = max(end - limit, 0) if limit else 0
+        else:
+            start = bisect_right(sort_keys, after_key)
+            end = (start + limit) if limit else len(items)
+
+        window = items[max(start, 0):max(end, 0)]
+        return list(reversed(window)) if descending else list(window)
+
+    def get_by_keys(self, *keys: Hashable) -> List[Model]:
+        """Returns the objects of the informed keys, in the same order. Keys not found are skipped"""
+
+        by_key = self.by_key
+        return [by_key[k] for k in keys if k in by_key]
+
+
+class _PositionsView:
+    """Read only view of the objects at the informed positions, supporting len and slicing"""
+
+    __slots__ = ('_objects', '_positions')
+
+    def __init__(self, objects: Sequence[Model], positions: List[int]):
+        self._objects = objects
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, item: slice) -> List[Model]:
+        objects = self._objects
+        return [objects[p] for p in self._positions[item]]
+
+
+@contextmanager
+def consistent_snapshots() -> Iterator[None]:
+    """
+    Context manager inside which data accessors keep returning the first snapshot they returned in it, so that all the
+    data accessed inside it (i.e. by a request, including its related objects) comes from a single version of the data
+    of each accessor, even if it is reloaded meanwhile. Tasks run by a BoundedExecutor share the context of the thread
+    that submitted them
+    """
+
+    token = _pinned_snapshots.set({})
+    try:
+        yield
+    finally:
+        _pinned_snapshots.reset(token)
+
+
+def pin_snapshot(owner: Hashable, snapshot: DataSnapshot) -> DataSnapshot:
+    """
+    Returns the snapshot of owner already returned inside the current consistent_snapshots context, if any. Otherwise,
+    snapshot is pinned for the rest of the context (if inside one) and returned
+
+    :param owner: the data accessor holding the snapshot
+    :param snapshot: current snapshot of owner
+    :return: snapshot to use
+    """
+
+    pinned = _pinned_snapshots.get()
+    return snapshot if pinned is None else pinned.setdefault(owner, snapshot)
@@ -1,4 +1,5 @@
 from flask import Flask
+from models import Model
 
 
 def create_app(test_config=None):
@@ -15,9 +16,14 @@ def create_app(test_config=None):
     app.app_context().push()
 
     app.static_data_path = f'{app.root_path}/../{app.config["STATIC_DATA_PATH"]}'
-    if not app.config.get('EMPLOYEES_API_URL') and not app.config.get('EMPLOYEES_DATA_ACCESSOR'):
-        # If EMPLOYEES_API_URL is not set, and neither custom EMPLOYEES_DATA_ACCESSOR is defined, then throw error
-        raise AttributeError('EMPLOYEES_API_URL or EMPLOYEES_DATA_ACCESSOR must be set.')
+    if not app.config.get('EMPLOYEES_API_URL') and not app.config.get('EMPLOYEES_DATA_ACCESSOR') \
+            and not app.config.get('EMPLOYEES_DATA_FILE'):
+        # If EMPLOYEES_API_URL is not set, and neither custom EMPLOYEES_DATA_ACCESSOR nor EMPLOYEES_DATA_FILE are
+        #  defined, then throw error
+        raise AttributeError('EMPLOYEES_API_URL, EMPLOYEES_DATA_ACCESSOR or EMPLOYEES_DATA_FILE must be set.')
+
+    # Concurrent fetches of sibling relationships when expanding related models. Disabled if not set
+    Model.set_related_models_max_workers(app.config.get('RELATED_MODELS_MAX_WORKERS'))
 
     from flaskr.employees import blueprint as employees_blueprint
     app.register_blueprint(employees_blueprint)
@@ -8,5 +8,81 @@ if os.environ.get('SECRET_KEY'):
 # STATIC_DATA_PATH is set relative to the root of the project. If not set in .env, it will be set at ./static_data
 STATIC_DATA_PATH = os.environ.get('STATIC_DATA_PATH') or 'static_data'
 
+# If STATIC_DATA_SNAPSHOTS is set, static data is loaded from the binary snapshots compiled next to its json files
+#  (python -m data_access.compile_snapshots static_data/*.json), falling back to the json files if missing or stale
+STATIC_DATA_SNAPSHOTS = os.environ.get('STATIC_DATA_SNAPSHOTS', '').lower() in ('1', 'true', 'yes')
+
+# If STATIC_DATA_RELOAD_INTERVAL is set, static data files are checked for changes every STATIC_DATA_RELOAD_INTERVAL
+#  seconds, and reloaded in background without restarting the workers. Each request keeps using the data it started with
+STATIC_DATA_RELOAD_INTERVAL = float(os.environ.get('STATIC_DATA_RELOAD_INTERVAL') or 0.)
+
 # Define employees api url in EMPLOYEES_API_URL
 EMPLOYEES_API_URL = os.environ.get('EMPLOYEES_API_URL')
+
+# Offline mode: if EMPLOYEES_DATA_FILE is set, employees are read from this JSON array or NDJSON file (memory mapped and
+#  parsed on demand) instead of from the employees api
+EMPLOYEES_DATA_FILE = os.environ.get('EMPLOYEES_DATA_FILE')
+
+# Timeouts (in seconds) and keep-alive connection pool size for requests to the employees api. If
+#  EMPLOYEES_API_CONNECT_TIMEOUT is not set, EMPLOYEES_API_TIMEOUT is used for both connecting and reading
+EMPLOYEES_API_TIMEOUT = float(os.environ.get('EMPLOYEES_API_TIMEOUT') or 30.)
+EMPLOYEES_API_CONNECT_TIMEOUT = float(os.environ['EMPLOYEES_API_CONNECT_TIMEOUT']) \
+    if os.environ.get('EMPLOYEES_API_CONNECT_TIMEOUT') else None
+EMPLOYEES_API_POOL_SIZE = int(os.environ.get('EMPLOYEES_API_POOL_SIZE') or 10)
+
+# Employees requested by key are split into several concurrent requests to the employees api, of at most
+#  EMPLOYEES_API_MAX_KEYS_PER_REQUEST keys and EMPLOYEES_API_MAX_URL_LENGTH bytes of url each
+EMPLOYEES_API_MAX_KEYS_PER_REQUEST = int(os.environ.get('EMPLOYEES_API_MAX_KEYS_PER_REQUEST') or 100)
+EMPLOYEES_API_MAX_URL_LENGTH = int(os.environ.get('EMPLOYEES_API_MAX_URL_LENGTH') or 2000)
+# Maximum number of those concurrent requests (and of concurrent page requests) at a time, shared by all the requests
+#  served by a worker process
+EMPLOYEES_API_MAX_WORKERS = int(os.environ.get('EMPLOYEES_API_MAX_WORKERS') or 4)
+
+# Maximum number of employees the employees api returns per request. Greater limits are split into several concurrent
+#  page requests, of at most EMPLOYEES_API_MAX_WORKERS at a time. If not set, limits are requested at once
+EMPLOYEES_API_PAGE_SIZE = int(os.environ['EMPLOYEES_API_PAGE_SIZE']) if os.environ.get('EMPLOYEES_API_PAGE_SIZE') \
+    else None
+
+# Comma separated names of the fields that the employees api can filter by, with query params named after them (i.e.
+#  department,office). Filtering employees by other fields responds with a 400 error
+EMPLOYEES_API_FILTERABLE_FIELDS = [f for f in (os.environ.get('EMPLOYEES_API_FILTERABLE_FIELDS') or '').split(',') if f]
+
+# Maximum limit of employees returned by a single request to the employees list view
+EMPLOYEES_LIST_MAX_LIMIT = int(os.environ.get('EMPLOYEES_LIST_MAX_LIMIT') or 1000)
+
+# Maximum number of related models fetches (for different expanded fields) run concurrently. If not set or < 2,
+#  related models are fetched sequentially
+RELATED_MODELS_MAX_WORKERS = int(os.environ.get('RELATED_MODELS_MAX_WORKERS') or 4)
+
+# Time (in seconds) that employees data is cached across requests, and maximum number of cached employees. If
+#  EMPLOYEES_CACHE_TTL is not set or 0, employees data is not cached
+EMPLOYEES_CACHE_TTL = float(os.environ.get('EMPLOYEES_CACHE_TTL') or 0.)
+EMPLOYEES_CACHE_MAX_ENTRIES = int(os.environ.get('EMPLOYEES_CACHE_MAX_ENTRIES') or 10000)
+
+# Time (in seconds) that employees not found are cached as missing, and maximum number of employees cached as missing.
+#  Applies even if EMPLOYEES_CACHE_TTL is not set (unless employees are mirrored). If set to 0, it is disabled
+EMPLOYEES_CACHE_NEGATIVE_TTL = float(os.environ.get('EMPLOYEES_CACHE_NEGATIVE_TTL') or 10.)
+EMPLOYEES_CACHE_MAX_NEGATIVE_ENTRIES = int(os.environ.get('EMPLOYEES_CACHE_MAX_NEGATIVE_ENTRIES') or 10000)
+
+# Seconds after EMPLOYEES_CACHE_TTL during which expired employees data is served while it is fetched again in
+#  background (stale-while-revalidate). If not set or 0, expired data is fetched again before being served
+EMPLOYEES_CACHE_STALE_TTL = float(os.environ.get('EMPLOYEES_CACHE_STALE_TTL') or 0.)
+
+# After EMPLOYEES_API_CIRCUIT_FAILURE_THRESHOLD consecutive failed requests to the employees api, requests fail fast
+#  without being sent for EMPLOYEES_API_CIRCUIT_RESET_TIMEOUT seconds. If set to 0, requests are always sent
+EMPLOYEES_API_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('EMPLOYEES_API_CIRCUIT_FAILURE_THRESHOLD') or 5)
+EMPLOYEES_API_CIRCUIT_RESET_TIMEOUT = float(os.environ.get('EMPLOYEES_API_CIRCUIT_RESET_TIMEOUT') or 30.)
+
+# Failed requests to the employees api (connection errors, timeouts, 429 and 5xx status codes) are retried up to
+#  EMPLOYEES_API_RETRIES times, waiting a random time of up to EMPLOYEES_API_RETRY_BACKOFF seconds (doubled on each
+#  retry). If EMPLOYEES_API_HEDGE_PERCENTILE is set, requests slower than that percentile of the latest requests
+#  latencies are sent again, using the first response
+EMPLOYEES_API_RETRIES = int(os.environ.get('EMPLOYEES_API_RETRIES') or 1)
+EMPLOYEES_API_RETRY_BACKOFF = float(os.environ.get('EMPLOYEES_API_RETRY_BACKOFF') or .05)
+EMPLOYEES_API_HEDGE_PERCENTILE = float(os.environ['EMPLOYEES_API_HEDGE_PERCENTILE']) \
+    if os.environ.get('EMPLOYEES_API_HEDGE_PERCENTILE') else None
+
+# If EMPLOYEES_MIRROR_REFRESH_INTERVAL is set, all employees are loaded at startup (EMPLOYEES_MIRROR_PAGE_SIZE per
+#  request) and served locally, refreshing them in background every EMPLOYEES_MIRROR_REFRESH_INTERVAL seconds
+EMPLOYEES_MIRROR_REFRESH_INTERVAL = float(os.environ.get('EMPLOYEES_MIRROR_REFRESH_INTERVAL') or 0.)
+EMPLOYEES_MIRROR_PAGE_SIZE = int(os.environ.get('EMPLOYEES_MIRROR_PAGE_SIZE') or 1000)
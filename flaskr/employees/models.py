@@ -1,16 +1,31 @@
 from flask import current_app as app
 from models import Model, StringField, IntegerField, RelatedModelField
-from data_access import InMemoryJsonFileDataAccessor, JsonRestApiDataAccessor
+from data_access import InMemoryJsonFileDataAccessor, JsonRestApiDataAccessor, CachedDataAccessor, \
+    MirroredDataAccessor, MmapJsonFileDataAccessor
 from typing import Union
 
 
+def _static_data_accessor(file_name: str) -> InMemoryJsonFileDataAccessor:
+    """
+    Returns the accessor of a static data file, loaded from its binary snapshot if STATIC_DATA_SNAPSHOTS is set, and
+    reloaded on changes if STATIC_DATA_RELOAD_INTERVAL is set
+    """
+
+    file_path = f'{app.static_data_path}/{file_name}'
+    return InMemoryJsonFileDataAccessor(
+        file_path,
+        snapshot_path=f'{file_path}.snapshot' if app.config.get('STATIC_DATA_SNAPSHOTS') else None,
+        reload_interval=app.config.get('STATIC_DATA_RELOAD_INTERVAL'),
+    )
+
+
 class Office(Model):
     id = IntegerField(is_key=True)
     city = StringField()
     country = StringField()
     address = StringField()
 
-    _data_accessor = InMemoryJsonFileDataAccessor(f'{app.static_data_path}/offices.json')
+    _data_accessor = _static_data_accessor('offices.json')
 
     def __init__(self, city: str, country: str, address: str, id: int = None):
         """Explicit __init__ override to expose creation signature for static checks"""
@@ -22,7 +37,7 @@ class Department(Model):
     name = StringField()
     superdepartment = RelatedModelField('self', nullable=True)
 
-    _data_accessor = InMemoryJsonFileDataAccessor(f'{app.static_data_path}/departments.json')
+    _data_accessor = _static_data_accessor('departments.json')
 
     def __init__(self, name: str, superdepartment: Union[int, 'Department'] = None, id: int = None):
         """Explicit __init__ override to expose creation signature for static checks"""
@@ -38,11 +53,56 @@ class Employee(Model):
     office = RelatedModelField(Office, nullable=True)
 
     # Employee data accessor can be configured to plug in a mocked data source for testing purposes. If
-    #  EMPLOYEES_DATA_ACCESSOR is not configured, actual JsonRestApiDataAccessor pointing to configured web API is used
-    _data_accessor = app.config.get('EMPLOYEES_DATA_ACCESSOR') or \
-        JsonRestApiDataAccessor(f'{app.config["EMPLOYEES_API_URL"]}/bigcorp/employees')
+    #  EMPLOYEES_DATA_ACCESSOR is not configured, employees are read from EMPLOYEES_DATA_FILE if configured (offline
+    #  mode), or else actual JsonRestApiDataAccessor pointing to configured web API is used
+    _data_accessor = app.config.get('EMPLOYEES_DATA_ACCESSOR') or (
+        MmapJsonFileDataAccessor(app.config['EMPLOYEES_DATA_FILE']) if app.config.get('EMPLOYEES_DATA_FILE') else None
+    ) or JsonRestApiDataAccessor(
+        f'{app.config["EMPLOYEES_API_URL"]}/bigcorp/employees',
+        timeout=app.config.get('EMPLOYEES_API_TIMEOUT', 30.),
+        connect_timeout=app.config.get('EMPLOYEES_API_CONNECT_TIMEOUT'),
+        pool_size=app.config.get('EMPLOYEES_API_POOL_SIZE', 10),
+        max_keys_per_request=app.config.get('EMPLOYEES_API_MAX_KEYS_PER_REQUEST', 100),
+        max_url_length=app.config.get('EMPLOYEES_API_MAX_URL_LENGTH', 2000),
+        max_workers=app.config.get('EMPLOYEES_API_MAX_WORKERS', 4),
+        page_size=app.config.get('EMPLOYEES_API_PAGE_SIZE'),
+        circuit_failure_threshold=app.config.get('EMPLOYEES_API_CIRCUIT_FAILURE_THRESHOLD', 5),
+        circuit_reset_timeout=app.config.get('EMPLOYEES_API_CIRCUIT_RESET_TIMEOUT', 30.),
+        retries=app.config.get('EMPLOYEES_API_RETRIES', 1),
+        retry_backoff=app.config.get('EMPLOYEES_API_RETRY_BACKOFF', .05),
+        hedge_percentile=app.config.get('EMPLOYEES_API_HEDGE_PERCENTILE'),
+        filterable_fields=app.config.get('EMPLOYEES_API_FILTERABLE_FIELDS', ()),
+    )
+    # If EMPLOYEES_MIRROR_REFRESH_INTERVAL is configured, all employees data is mirrored locally. Otherwise, if
+    #  EMPLOYEES_CACHE_TTL is configured, employees data is cached across requests. Employees not found in the
+    #  employees api are cached as missing for EMPLOYEES_CACHE_NEGATIVE_TTL seconds, even if EMPLOYEES_CACHE_TTL is not
+    if app.config.get('EMPLOYEES_MIRROR_REFRESH_INTERVAL'):
+        _data_accessor = MirroredDataAccessor(
+            _data_accessor,
+            page_size=app.config.get('EMPLOYEES_MIRROR_PAGE_SIZE', 1000),
+            refresh_interval=app.config['EMPLOYEES_MIRROR_REFRESH_INTERVAL'],
+        )
+    elif app.config.get('EMPLOYEES_CACHE_TTL') or \
+            app.config.get('EMPLOYEES_CACHE_NEGATIVE_TTL', 10.) and isinstance(_data_accessor, JsonRestApiDataAccessor):
+        _data_accessor = CachedDataAccessor(
+            _data_accessor,
+            ttl=app.config.get('EMPLOYEES_CACHE_TTL', 0.),
+            max_entries=app.config.get('EMPLOYEES_CACHE_MAX_ENTRIES', 10000),
+            stale_ttl=app.config.get('EMPLOYEES_CACHE_STALE_TTL', 0.),
+            negative_ttl=app.config.get('EMPLOYEES_CACHE_NEGATIVE_TTL', 10.),
+            max_negative_entries=app.config.get('EMPLOYEES_CACHE_MAX_NEGATIVE_ENTRIES', 10000),
+        )
 
     def __init__(self, first: str, last: str, manager: Union[int, 'Employee'] = None,
                  department: Union[int, Department] = None, office: Union[int, Office] = None, id: int = None):
         """Explicit __init__ override to expose creation signature for static checks"""
         super().__init__(id=id, first=first, last=last, manager=manager, department=department, office=office)
+
+
+# Mirrored employees data is loaded at startup, so that no request has to wait for it. If the employees api is not
+#  available at startup, the worker still starts, and the data is loaded on the first request that needs it
+if isinstance(Employee._data_accessor, MirroredDataAccessor):
+    try:
+        Employee._data_accessor.load(Employee)
+    except Exception as e:
+        app.logger.warning(f'Employees mirror could not be loaded at startup, it will be loaded on first use: {e}')
@@ -1,6 +1,6 @@
-from views import list_view, retrieve_view
+from flask import current_app as app
+from views import list_view, retrieve_view, json_response
 from .models import Office, Department, Employee
-from flask import jsonify
 
 
 def list_offices():
@@ -20,11 +20,11 @@ def retrieve_department(key: int):
 
 
 def list_employees():
-    return list_view(Employee)
+    return list_view(Employee, max_limit=app.config.get('EMPLOYEES_LIST_MAX_LIMIT', 1000))
 
 
 def retrieve_employee(key: int):
     if key <= 0:
-        return jsonify({'error': 'Key should be greater than 0'}), 400
+        return json_response({'error': 'Key should be greater than 0'}), 400
 
     return retrieve_view(Employee, key)
@@ -1,3 +1,4 @@
 from models.fields import *
 from models.models import *
 from models.exceptions import *
+from models.concurrency import *
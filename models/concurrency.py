@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import BoundedSemaphore
+from typing import Callable, Iterable, Iterator, List, Any
+from collections import deque
+from contextvars import copy_context
+
+
+class BoundedExecutor:
+    """
+    Thread pool to run independent tasks concurrently, with at most max_workers of them running at the same time.
+    Tasks that find no free worker are run in the calling thread instead of being queued. This makes it safe for tasks
+    to use the same executor to run their own subtasks (i.e. nested relationships), as no task ever waits for a queued
+    task that has no worker available to run it. Tasks are run in a copy of the context of the thread that submitted
+    them, so they see the same context variables.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        :param max_workers: maximum number of tasks running concurrently in the pool's threads. Should be >= 1
+        """
+
+        if max_workers < 1:
+            raise ValueError('max_workers should be >= 1')
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='related-models')
+        self._slots = BoundedSemaphore(max_workers)
+
+    def _submit(self, task: Callable[[], Any]) -> Future:
+        if self._slots.acquire(blocking=False):
+            def run():
+                try:
+                    return task()
+                finally:
+                    self._slots.release()
+            try:
+                return self._executor.submit(copy_context().run, run)
+            except BaseException:
+                self._slots.release()
+                raise
+
+        # No free worker: run the task in the current thread
+        future = Future()
+        try:
+            future.set_result(task())
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def run_all(self, tasks: Iterable[Callable[[], Any]], return_exceptions: bool = False) -> List[Any]:
+        """
+        Runs all tasks, concurrently when possible, and waits for all of them to finish
+
+        :param tasks: callables without arguments
+        :param return_exceptions: if True, the exceptions (Exception subclasses) raised by failed tasks are returned as
+         their results instead of being raised
+        :return: list with the tasks' results, in the same order as the tasks. If any of the tasks failed, the exception
+         of the first failed task (in the tasks order) is raised once all of the tasks finished
+        """
+
+        tasks = list(tasks)
+        if len(tasks) <= 1 and not return_exceptions:
+            return [task() for task in tasks]
+
+        # The last task is run in the current thread, that would otherwise be idle waiting for the rest
+        futures = [self._submit(task) for task in tasks[:-1]]
+        if tasks:
+            last = Future()
+            try:
+                last.set_result(tasks[-1]())
+            except BaseException as e:
+                last.set_exception(e)
+            futures.append(last)
+
+        errors = [f.exception() for f in futures]
+        if return_exceptions:
+            # Only exceptions are returned: KeyboardInterrupt, SystemExit and the like are still raised
+            for error in errors:
+                if error is not None and not isinstance(error, Exception):
+                    raise error
+            return [error if error is not None else f.result() for f, error in zip(futures, errors)]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [f.result() for f in futures]
+
+    def iter_results(self, tasks: Iterable[Callable[[], Any]]) -> Iterator[Any]:
+        """
+        Runs tasks concurrently, yielding their results in the tasks order as soon as they are available. At most
+        max_workers tasks are run ahead of the results consumed. If a task failed, its exception is raised when its
+        result is reached
+
+        :param tasks: callables without arguments
+        :return: iterator of the tasks' results, in the same order as the tasks
+        """
+
+        pending = deque()
+        for task in tasks:
+            if len(pending) >= self.max_workers:
+                yield pending.popleft().result()
+            pending.append(self._submit(task))
+        while pending:
+            yield pending.popleft().result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -1,4 +1,4 @@
-from typing import Any, Hashable, Union, Type, Optional
+from typing import Any, Hashable, Union, Type, Optional, Iterable
 from .exceptions import ModelException
 
 
@@ -54,6 +54,16 @@ class ModelField:
                 f"Error when converting value to {self.field_type.__name__} type for field '{self.name}': {str(e)}"
             )
 
+    def are_trusted_values(self, values: Iterable[Any]) -> bool:
+        """
+        Returns True if all values are already valid values for the field, i.e. get_value(v) would return v itself
+        without errors, allowing to skip their conversion. Values are checked all at once (by their set of types) to
+        validate whole columns of data efficiently. If type requires additional validations, that Field subclass should
+        redefine this method.
+        """
+
+        return set(map(type, values)) <= ({self.field_type, type(None)} if self.nullable else {self.field_type})
+
     def get_related_model_field_type(self, model: 'ModelType') -> 'Model':
         """
         Method that returns the related_model class
@@ -105,6 +115,12 @@ class StringField(ModelField):
 
         return v
 
+    def are_trusted_values(self, values: Iterable[Any]) -> bool:
+        values = list(values)
+        return super().are_trusted_values(values) and (
+            not self._max_length or all(len(v) <= self._max_length for v in values if v is not None)
+        )
+
 
 class IntegerField(ModelField):
     """Subclass of ModelField for integer fields"""
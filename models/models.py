@@ -1,58 +1,294 @@
-from typing import NamedTuple, Any, Dict, Iterable, Hashable, Optional, List, Type
+from typing import NamedTuple, Any, Dict, Iterable, Hashable, Optional, List, Type, Tuple, Union, Sequence
 from models.fields import ModelField
-from copy import deepcopy
+from models.concurrency import BoundedExecutor
+from functools import partial, lru_cache
 from .exceptions import ModelException
 
 
 ModelType = Type['Model']
 
 
-class RelatedModelRequest(NamedTuple):
+class RelationshipPlan(NamedTuple):
+    """A related model to fetch for a field, and the plan to expand its own relationships"""
+    field_name: str
     related_model: ModelType
-    next_level_relationships: List[str]
+    next_level: 'ExpansionPlan'
 
 
-RelatedModelRequests = Dict[str, RelatedModelRequest]
+class ExpansionPlan(NamedTuple):
+    """
+    Validated, hashable and reusable representation of the relationships to expand for objects of a model. Created by
+    Model.compile_relationships, it can be used as with_related argument of Models fetch methods
+    """
+    model: ModelType
+    relationships: Tuple[RelationshipPlan, ...]
 
+    def only(self, selection: Optional['FieldSelection']) -> 'ExpansionPlan':
+        """
+        Returns the plan without the relationships (at any level) whose fields are not included in selection, so that
+        related models that won't be part of the results are not fetched. If selection is None, returns the same plan
+        """
+
+        return self if selection is None else _prune_expansion_plan(self, selection)
+
+
+class FieldSelection(NamedTuple):
+    """
+    Validated, hashable and reusable selection of the fields of a model to include in its dict representation, created
+    by Model.compile_fields. Related models fields can have their own selection of fields
+    """
+    model: ModelType
+    fields: Tuple[str, ...]
+    related: Tuple[Tuple[str, 'FieldSelection'], ...]
+
+
+# with_related arguments can be either relationships strings, or an already compiled ExpansionPlan
+Relationships = Union[Iterable[str], ExpansionPlan]
+
+
+@lru_cache(maxsize=1024)
+def _compile_expansion_plan(model: ModelType, relationships: Tuple[str, ...]) -> ExpansionPlan:
+    """
+    Compiles the relationships strings into an ExpansionPlan, validating them for the model. Compiled plans are
+    cached by model and (normalized) relationships, so each different set of relationships is only validated once
+
+    :param model: Model whose objects relationships will be expanded
+    :param relationships: normalized relationships (sorted, without duplicates)
+    :return: ExpansionPlan for model's relationships
+    """
+
+    fields = model._get_fields()
+    related_models: Dict[str, ModelType] = {}
+    next_level_relationships: Dict[str, List[str]] = {}
+    for r in relationships:
+        field_name, _, next_level_relationship = r.partition(Model._RELATIONSHIPS_SEPARATOR)
+
+        if field_name not in fields:
+            raise Model.UndefinedField(f"{model.__name__} has no '{field_name}' field")
+
+        if field_name not in related_models:
+            related_models[field_name] = model._related_models.get(field_name) or \
+                fields[field_name].get_related_model_field_type(model)
+            next_level_relationships[field_name] = []
+
+        if next_level_relationship:
+            next_level_relationships[field_name].append(next_level_relationship)
+
+    # Recursive compilation (and validation) of next level relationships
+    return ExpansionPlan(model=model, relationships=tuple(
+        RelationshipPlan(
+            field_name=field_name,
+            related_model=related_model,
+            next_level=related_model.compile_relationships(next_level_relationships[field_name]),
+        ) for field_name, related_model in related_models.items()
+    ))
+
+
+@lru_cache(maxsize=1024)
+def _compile_field_selection(model: ModelType, fields: Tuple[str, ...]) -> FieldSelection:
+    """
+    Compiles fields strings into a FieldSelection, validating them for the model. Compiled selections are cached by
+    model and (normalized) fields
+
+    :param model: Model whose objects fields are selected
+    :param fields: normalized fields (sorted, without duplicates)
+    :return: FieldSelection for model's fields
+    """
+
+    model_fields = model._get_fields()
+    whole_fields = set()
+    next_level_fields: Dict[str, List[str]] = {}
+    for f in fields:
+        field_name, _, next_level_field = f.partition(Model._RELATIONSHIPS_SEPARATOR)
+        if field_name not in model_fields:
+            raise Model.UndefinedField(f"{model.__name__} has no '{field_name}' field")
+        if next_level_field:
+            next_level_fields.setdefault(field_name, []).append(next_level_field)
+        else:
+            whole_fields.add(field_name)
+
+    related = []
+    for field_name, next_level in next_level_fields.items():
+        # Raises ModelField.NoRelatedModel for fields without related model
+        related_model = model._related_models.get(field_name) or \
+            model_fields[field_name].get_related_model_field_type(model)
+        if field_name not in whole_fields:
+            related.append((field_name, related_model.compile_fields(next_level)))
+
+    return FieldSelection(
+        model=model,
+        fields=tuple(f for f in model_fields if f in whole_fields or f in next_level_fields),
+        related=tuple(related),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _prune_expansion_plan(plan: ExpansionPlan, selection: FieldSelection) -> ExpansionPlan:
+    """Returns plan without the relationships whose fields are not included in selection (see ExpansionPlan.only)"""
+
+    related_selections = dict(selection.related)
+    return plan._replace(relationships=tuple(
+        rel._replace(next_level=rel.next_level.only(related_selections.get(rel.field_name)))
+        for rel in plan.relationships if rel.field_name in selection.fields
+    ))
+
+
+class ModelMeta(type):
+    """
+    Metaclass of Model. Extracts fields meta info from the ModelFields declared as class variables, once, on the
+    creation of every Model subclass. Declared fields are replaced by __slots__, so that objects hold their values in a
+    compact layout, without a per object __dict__
+    """
+
+    def __new__(mcs, name: str, bases: tuple, namespace: Dict[str, Any], **kwargs) -> 'ModelMeta':
+        declared_fields = {f: v for f, v in namespace.items() if isinstance(v, ModelField)}
+        inherited_fields = {}
+        for base in reversed(bases):
+            inherited_fields.update(getattr(base, '_fields', {}))
+
+        # Fields are removed from the class variables and replaced by slots (unless already defined by a base class)
+        namespace = {k: v for k, v in namespace.items() if k not in declared_fields}
+        slots = namespace.get('__slots__', ())
+        namespace['__slots__'] = ((slots,) if isinstance(slots, str) else tuple(slots)) + tuple(
+            f for f in declared_fields if f not in inherited_fields
+        )
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+
+        cls._fields = {**inherited_fields, **declared_fields}
+        for field_name, field in declared_fields.items():
+            field.name = field_name
+
+        key_fields = [n for n, f in cls._fields.items() if f.is_key]
+        cls._key_field_name = key_fields[0] if key_fields else None
+        cls._key_fields_count = len(key_fields)
+
+        # Related models that can be resolved on class creation. Any other field with related_model is resolved on use,
+        #  so that get_related_model_field_type raises the appropriate error
+        cls._related_models = {}
+        for field_name, field in cls._fields.items():
+            if field.related_model is not None and (
+                    not isinstance(field.related_model, str) or field.related_model == 'self'):
+                cls._related_models[field_name] = field.get_related_model_field_type(cls)
+
+        return cls
+
+
+class Model(metaclass=ModelMeta):
+    __slots__ = ()
 
-class Model:
     _RELATIONSHIPS_SEPARATOR = '.'
     _data_accessor: 'DataAccessor' = None
+    # Executor used to fetch sibling relationships concurrently. If None, they are fetched sequentially
+    _related_models_executor: Optional[BoundedExecutor] = None
+
+    # Fields meta info, computed once per Model subclass on its creation (see ModelMeta)
+    _fields: Dict[str, ModelField]
+    _key_field_name: Optional[str]
+    _key_fields_count: int
+    _related_models: Dict[str, ModelType]
 
     def __init__(self, **field_values) -> None:
         """
-        Models base __init__ logic. Extract fields meta info from class variables and set validated data from received
-        arguments
+        Models base __init__ logic. Set validated data from received arguments, using fields meta info of the class
         """
 
-        # Extract fields from class' existing class variables
-        self.__fields = self.__class__._get_fields()
+        cls = self.__class__
+        fields = cls._fields
 
-        if len([f for f in self.__fields.values() if f.is_key]) != 1:
-            exception_type = Model.MultipleKeys if bool(len([f for f in self.__fields.values() if f.is_key])) \
-                else Model.NoKey
+        if cls._key_fields_count != 1:
+            exception_type = Model.MultipleKeys if cls._key_fields_count else Model.NoKey
             raise exception_type('Model needs to have one (and only one) key field.')
 
         # Check if any undefined field for the model was sent as a kwarg
-        undefined_informed_fields = [fn for fn in field_values if fn not in self.__fields]
-        if undefined_informed_fields:
+        if not field_values.keys() <= fields.keys():
+            undefined_informed_fields = [fn for fn in field_values if fn not in fields]
             raise Model.UndefinedField(
                 f'Unexpected value{"s" if len(undefined_informed_fields) > 1 else ""} informed for '
-                f'{self.__class__.__name__}: "{", ".join(undefined_informed_fields)}"'
+                f'{cls.__name__}: "{", ".join(undefined_informed_fields)}"'
             )
 
         # Iterate through model's fields to set values, using Field's get_value method to properly set each value's type
         #  while performing basic validations
-        for field_name, field in self.__fields.items():
+        for field_name, field in fields.items():
             try:
                 raise_error = None
-                field.name = field_name
                 setattr(self, field_name, field.get_value(field_values.get(field_name)))
             except ValueError as e:
                 raise_error = ValueError(f'{field_name}: {e}')
             if raise_error:
                 raise raise_error
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> List['Model']:
+        """
+        Bulk constructor for trusted sources (i.e. data accessors) that build many objects at once. Rows are validated
+        once per batch, field by field: if all rows only have defined fields, and all values of each field already have
+        the field's type, objects are built setting values as they are, skipping __init__ per field conversion and
+        error handling. Otherwise, objects are built through __init__, so invalid rows raise the same errors they would
+        when creating their objects one by one
+
+        :param rows: dicts with the fields values of each object
+        :return: list of models of the current class, in the same order as rows
+        """
+
+        if cls._key_fields_count != 1:
+            exception_type = Model.MultipleKeys if cls._key_fields_count else Model.NoKey
+            raise exception_type('Model needs to have one (and only one) key field.')
+
+        rows = rows if isinstance(rows, list) else list(rows)
+        fields = cls._fields
+        field_names = fields.keys()
+        if not all(row.keys() <= field_names for row in rows) or \
+                not all(field.are_trusted_values([row.get(n) for row in rows]) for n, field in fields.items()):
+            return [cls(**row) for row in rows]
+
+        new = cls.__new__
+        field_names = list(field_names)
+        objects = []
+        for row in rows:
+            obj = new(cls)
+            for field_name in field_names:
+                setattr(obj, field_name, row.get(field_name))
+            objects.append(obj)
+        return objects
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[Any]]) -> List['Model']:
+        """
+        Bulk constructor for trusted sources that store data by column (i.e. binary snapshots). Columns are validated
+        as in from_rows and, if valid, objects are built setting each field's values column by column. Otherwise, they
+        are built through from_rows
+
+        :param columns: dict with a sequence of values of each field, all of them of the same length. Missing fields
+         are None
+        :return: list of models of the current class, in the same order as the columns values
+        """
+
+        if cls._key_fields_count != 1:
+            exception_type = Model.MultipleKeys if cls._key_fields_count else Model.NoKey
+            raise exception_type('Model needs to have one (and only one) key field.')
+
+        fields = cls._fields
+        size = len(next(iter(columns.values()))) if columns else 0
+        if any(len(values) != size for values in columns.values()):
+            raise ValueError('All columns should have the same length')
+        if not columns.keys() <= fields.keys() or \
+                not all(field.are_trusted_values(columns.get(n, (None,) * size)) for n, field in fields.items()):
+            names = list(columns)
+            return cls.from_rows([dict(zip(names, values)) for values in zip(*(columns[n] for n in names))])
+
+        new = cls.__new__
+        objects = [new(cls) for _ in range(size)]
+        for field_name in fields:
+            values = columns.get(field_name)
+            if values is None:
+                for obj in objects:
+                    setattr(obj, field_name, None)
+            else:
+                for obj, value in zip(objects, values):
+                    setattr(obj, field_name, value)
+        return objects
+
     def __str__(self) -> str:
         return f'{self.__class__.__name__} object {str(self.key or "")}'.strip()
 
@@ -63,20 +299,33 @@ class Model:
         return self.__class__ == other.__class__ and bool(self.key) and self.key == other.key
 
     @classmethod
-    def _get_fields(cls):
-        return {f: v for f, v in cls.__dict__.items() if isinstance(v, ModelField)}
+    def _get_fields(cls) -> Dict[str, ModelField]:
+        return cls._fields
 
     @classmethod
     def key_field_name(cls) -> str:
         """Returns model's name of key field (Field with is_key = True)"""
-        key__fields = [n for n, f in cls.__dict__.items() if isinstance(f, ModelField) and f.is_key]
-        return key__fields[0] if key__fields else None
+        return cls._key_field_name
 
     @property
     def key(self) -> Any:
         """Returns objects's key value"""
 
-        return getattr(self, self.__class__.key_field_name())
+        return getattr(self, self.__class__._key_field_name)
+
+    @staticmethod
+    def set_related_models_max_workers(max_workers: Optional[int]) -> None:
+        """
+        Configures how many related models fetches (i.e. the ones for the different fields requested with with_related)
+        can run concurrently, for all models. If max_workers is None or < 2, they are fetched sequentially
+
+        :param max_workers: maximum number of concurrent fetches of related models
+        """
+
+        previous_executor = Model._related_models_executor
+        Model._related_models_executor = BoundedExecutor(max_workers) if max_workers and max_workers > 1 else None
+        if previous_executor:
+            previous_executor.shutdown(wait=False)
 
     @classmethod
     def _check_data_accessor_is_assigned(cls):
@@ -93,7 +342,7 @@ class Model:
             raise Model.NoDataAccessor(f'_data_accessor should be of type DataAccessor on Model {cls.__name__}.')
 
     @classmethod
-    def get(cls, limit: int = None, offset: int = None, with_related: Iterable[str] = None,
+    def get(cls, limit: int = None, offset: int = None, with_related: Relationships = None,
             **kwargs: Any) -> Iterable['Model']:
         """
         Data fetch method for Models, it calls its _data_accessor object. Fetches multiple objects.
@@ -101,106 +350,114 @@ class Model:
         :param limit: if informed, limits the quantity of objects to fetch
         :param offset: offset value. If informed, start fetching data from this position
         :param with_related: list of related models to fetch (subsequent call to related models .get methods will be
-         issued after successful fetch of current model's data)
+         issued after successful fetch of current model's data), or an ExpansionPlan compiled from it
         :param kwargs: any other arbitrary kwargs that the data accessor might need to retrieve the data
         :return: list (or other type of iterable) of models of type model_type
         """
 
         cls._check_data_accessor_is_assigned()
-        return cls.get_related_models(
-            cls._data_accessor.get(cls, limit=limit, offset=offset, **kwargs),
-            *(with_related or []),
-        )
+        plan = cls.compile_relationships(with_related)
+        return cls._expand(cls._data_accessor.get(cls, limit=limit, offset=offset, **kwargs), plan)
 
     @classmethod
-    def get_by_keys(cls, *keys: Hashable, with_related: Iterable[str] = None, **kwargs: Any) -> Iterable['Model']:
+    def get_by_keys(cls, *keys: Hashable, with_related: Relationships = None, **kwargs: Any) -> Iterable['Model']:
         """
         Data fetch method for Models, it calls its _data_accessor object. Fetches multiple objects by their keys.
 
         :param keys: inform 0 to n keys to fetch data from related objects
         :param with_related: list of related models to fetch (subsequent call to related models .get methods will be
-         issued after successful fetch of current model's data)
+         issued after successful fetch of current model's data), or an ExpansionPlan compiled from it
         :param kwargs: any other arbitrary kwargs that the data accessor might need to retrieve the data
         :return: list (or other type of iterable) of models of type model_type
         """
 
         cls._check_data_accessor_is_assigned()
+        plan = cls.compile_relationships(with_related)
         if not keys:
             return []
-        return cls.get_related_models(
-            cls._data_accessor.get_by_keys(cls, *keys, **kwargs),
-            *(with_related or []),
-        )
+        return cls._expand(cls._data_accessor.get_by_keys(cls, *keys, **kwargs), plan)
 
     @classmethod
-    def get_by_key(cls, key: Hashable, with_related: Iterable[str] = None, **kwargs: Any) -> Optional['Model']:
+    def get_by_key(cls, key: Hashable, with_related: Relationships = None, **kwargs: Any) -> Optional['Model']:
         """
         Data fetch method for Models, it calls its _data_accessor object. Fetches one object by key. Returns None if not
          found
 
         :param key: id of the model to retrieve from data
         :param with_related: list of related models to fetch (subsequent call to related models .get methods will be
-         issued after successful fetch of current model's data)
+         issued after successful fetch of current model's data), or an ExpansionPlan compiled from it
         :param kwargs: any other arbitrary kwargs that the data accessor might need to retrieve the data
         :return: A model of type model_type, or None
         """
 
         cls._check_data_accessor_is_assigned()
+        plan = cls.compile_relationships(with_related)
         obj = cls._data_accessor.get_by_key(cls, key, **kwargs)
-        if obj and with_related:
-            return obj.get_related(*with_related)
+        if obj and plan.relationships:
+            return cls._expand([obj], plan)[0]
         return obj
 
     @classmethod
-    def _get_validated_relationships(cls, relationships: Iterable[str]) -> RelatedModelRequests:
-        fields = cls._get_fields()
-        normalized_related_models_request = {}
-        for r in relationships:
-            if len(r.split(Model._RELATIONSHIPS_SEPARATOR)) > 1:
-                field_name, next_level_relationship = r.split(Model._RELATIONSHIPS_SEPARATOR, 1)
-            else:
-                field_name, next_level_relationship = [r, '']
+    def compile_relationships(cls, relationships: Relationships) -> ExpansionPlan:
+        """
+        Validates relationships with other models and compiles them into a reusable ExpansionPlan. Raises
+        Model.UndefinedField or ModelField.NoRelatedModel exceptions for invalid relationships
 
-            if field_name not in fields:
-                raise Model.UndefinedField(f"{cls.__name__} has no '{field_name}' field")
+        :param relationships: list of 0 to n relationships with other models. If accessing to level > 1 rel,
+         should represent jump to next level with a '.'. If an ExpansionPlan is informed, it is returned as it is
+        :return: ExpansionPlan for the relationships
+        """
 
-            if field_name not in normalized_related_models_request:
-                field = fields[field_name]
-                field_type = field.get_related_model_field_type(cls)
-                normalized_related_models_request[field_name] = RelatedModelRequest(
-                    related_model=field_type,
-                    next_level_relationships=[],
-                )
+        if isinstance(relationships, ExpansionPlan):
+            if relationships.model is not cls:
+                raise Model.IncorrectModelType(f'Expansion plan should be for {cls.__name__} objects.')
+            return relationships
 
-            if next_level_relationship and \
-                    next_level_relationship \
-                    not in normalized_related_models_request[field_name].next_level_relationships:
-                normalized_related_models_request[field_name].next_level_relationships.append(next_level_relationship)
+        return _compile_expansion_plan(cls, tuple(sorted(set(relationships or []))))
 
-        # Recursive validation of relationships
-        for rel in normalized_related_models_request.values():
-            rel.related_model._get_validated_relationships(rel.next_level_relationships)
+    @classmethod
+    def compile_fields(cls, fields: Optional[Iterable[str]]) -> Optional[FieldSelection]:
+        """
+        Validates a selection of fields of the model and compiles it into a reusable FieldSelection. Raises
+        Model.UndefinedField or ModelField.NoRelatedModel exceptions for invalid fields
+
+        :param fields: list of fields names. Fields of related models can be selected with a '.' (i.e. manager.first),
+         in which case only those fields are included for the related model (unless the whole field is also selected)
+        :return: FieldSelection for the fields, or None if no fields were informed (meaning all fields)
+        """
 
-        return normalized_related_models_request
+        if not fields:
+            return None
+        return _compile_field_selection(cls, tuple(sorted(set(fields))))
 
     @classmethod
     def get_related_models(cls, objects: Iterable['Model'], *relationships: str) -> List['Model']:
         """
         Adds related models data to objects
 
-        :param objects: base objects of current class. a copy of this objects will be returned, with additional data
+        :param objects: base objects of current class. a copy of this objects will be returned, with additional data.
+         Copies are shallow: related models objects are shared between copies and the original objects, so objects
+         should not be modified once fetched
         :param relationships: list of 0 to n relationships with other models. If accessing to level > 1 rel,
          should represent jump to next level with a '.'
         :return: a copy of the current objects including the related models data
         """
 
-        # validated_relationships will hold a dict where each key is a field with a related_model whose related data
-        #  should be fetched, and the value holds all of the next levels relationships for those fields (if any),
-        #  to allow recursive access to this method to arbitrarily deep related data
-        validated_relationships = cls._get_validated_relationships(relationships)
+        return cls._expand(objects, cls.compile_relationships(relationships))
+
+    @classmethod
+    def _expand(cls, objects: Iterable['Model'], plan: ExpansionPlan) -> List['Model']:
+        """
+        Adds related models data to objects, running an already compiled ExpansionPlan
+
+        :param objects: base objects of current class. a copy of this objects will be returned, with additional data
+        :param plan: ExpansionPlan of the current class. For each of its relationships, the related model is fetched and
+         its next level plan is recursively run for the fetched objects
+        :return: a copy of the current objects including the related models data
+        """
 
         # if no objects provided, or no relationships, the original objects can be returned in their original form
-        if not objects or not relationships:
+        if not objects or not plan.relationships:
             return objects or []
 
         # new_objects dict will hold the copied objects to return. the objects' keys will be used as keys for the dict
@@ -215,10 +472,11 @@ class Model:
                 raise Model.IncorrectModelType(f'All objects should be an instance of {cls.__name__}.')
 
             if obj.key not in new_objects:  # avoid duplicates
-                new_objects[obj.key] = deepcopy(obj)  # copy original objects into new_objects
+                new_objects[obj.key] = obj._copy()  # copy original objects into new_objects
 
                 # Iterate through all of the requested related fields
-                for field_name in validated_relationships:
+                for rel in plan.relationships:
+                    field_name = rel.field_name
 
                     if field_name not in fetch_keys:
                         # add the field_name key to the fetch_keys dict if not in there already
@@ -236,15 +494,23 @@ class Model:
                             fetch_keys[field_name][related_value] = set()
                         fetch_keys[field_name][related_value].add(obj.key)
 
-        # Iterate through all validated relationships to call the get_by_keys for each related model to fetch the needed
-        #  objects of each type. Include the with_related=rel.next_level_relationships to recursively use this method to
-        # fetch any deeper level related data that was requested
-        for field_name, fetch_keys_relationship in fetch_keys.items():
-            rel = validated_relationships[field_name]
-            for related_model in rel.related_model.get_by_keys(
-                    *fetch_keys_relationship.keys(),
-                    with_related=rel.next_level_relationships,
-            ):
+        # Call the get_by_keys for each related model to fetch the needed objects of each type. Include the
+        #  with_related=rel.next_level plan to recursively use this method to fetch any deeper level related data that
+        #  was requested. Fetches for the different fields are independent, so they are run concurrently if a
+        #  _related_models_executor is configured
+        next_levels = {rel.field_name: rel for rel in plan.relationships}
+        fetches = [
+            partial(
+                next_levels[field_name].related_model.get_by_keys,
+                *fetch_keys_relationship.keys(),
+                with_related=next_levels[field_name].next_level,
+            ) for field_name, fetch_keys_relationship in fetch_keys.items()
+        ]
+        executor = Model._related_models_executor
+        fetched_related_models = executor.run_all(fetches) if executor else [fetch() for fetch in fetches]
+
+        for (field_name, fetch_keys_relationship), related_models in zip(fetch_keys.items(), fetched_related_models):
+            for related_model in related_models:
                 # Set the received object in the appropriate field in every oriignal object that had the key value for
                 #  the field
                 for target_object_key in fetch_keys_relationship[related_model.key]:
@@ -252,6 +518,18 @@ class Model:
 
         return list(new_objects.values())
 
+    def _copy(self) -> 'Model':
+        """
+        Returns a shallow copy of the object: a new object with the same fields values, without copying the values
+        themselves (including related models objects). Its cost depends only on the quantity of fields of the model
+        """
+
+        cls = self.__class__
+        new_object = cls.__new__(cls)
+        for field_name in cls._fields:
+            setattr(new_object, field_name, getattr(self, field_name))
+        return new_object
+
     def get_related(self, *relationships: str) -> 'Model':
         """
         Adds related models data to object
@@ -263,14 +541,23 @@ class Model:
 
         return self.__class__.get_related_models([self], *relationships)[0]
 
-    def to_dict(self, exclude_none: bool = False) -> Dict[str, Any]:
+    def to_dict(self, exclude_none: bool = False, fields: Optional[FieldSelection] = None) -> Dict[str, Any]:
         """
         Returns model's dict representation. If exclude_none is True, fields with None value won't be included in the
-        resulting Dict
+        resulting Dict. If a FieldSelection is informed (see compile_fields), only its fields are included (and only the
+        selected fields of related models)
         """
 
-        return {k: v if not isinstance(v, Model) else v.to_dict(exclude_none=exclude_none) for k, v in [
-            (f, getattr(self, f)) for f in self.__fields
+        if fields is None:
+            return {k: v if not isinstance(v, Model) else v.to_dict(exclude_none=exclude_none) for k, v in [
+                (f, getattr(self, f)) for f in self.__class__._fields
+            ] if not exclude_none or v is not None}
+
+        related_selections = dict(fields.related)
+        return {k: v if not isinstance(v, Model) else v.to_dict(
+            exclude_none=exclude_none, fields=related_selections.get(k),
+        ) for k, v in [
+            (f, getattr(self, f)) for f in fields.fields
         ] if not exclude_none or v is not None}
 
     class MultipleKeys(ModelException):
@@ -2,7 +2,9 @@ from pytest import fixture
 from flaskr import create_app
 from flaskr.employees import Office, Department, Employee
 from tests.config_test import config_test
-from tests.utils import _test_retrieve_model, _test_retrieve_model_not_found, _test_list_model
+from tests.utils import _test_retrieve_model, _test_retrieve_model_not_found, _test_list_model, LocalEmployeesApi
+from data_access import JsonRestApiDataAccessor
+from base64 import urlsafe_b64encode
 import json
 
 
@@ -145,3 +147,158 @@ def test_retrieve_employee_with_invalid_related_model(client):
     resp = client.get(f'/employees?expand={no_related_model_field}')
     assert resp.status_code == 400
     assert json.loads(resp.data)['error'] == f"Employee's field '{no_related_model_field}' has no related_model defined"
+
+
+def test_list_employees_streamed(client):
+    """
+    Tests fetching employees from /employees view as a streamed JSON array, and compares the results to getting the
+    same objects directly through the model
+    """
+
+    attrs = {'limit': 500, 'offset': 5, 'with_related': ['manager', 'office']}
+    resp = client.get('/employees?limit=500&offset=5&expand=manager&expand=office&format=stream')
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert json.loads(resp.data) == [o.to_dict() for o in Employee.get(**attrs)]
+
+
+def test_list_employees_ndjson(client):
+    """Tests fetching employees from /employees view as NDJSON, requested through the Accept header"""
+
+    resp = client.get('/employees?limit=20', headers={'Accept': 'application/x-ndjson'})
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/x-ndjson'
+    assert [json.loads(line) for line in resp.data.decode().splitlines()] == \
+        [o.to_dict() for o in Employee.get(limit=20)]
+
+
+def test_list_employees_streamed_with_invalid_related_model(client):
+    """Tests for 400 error when streaming from /employees trying to expand on undefined field"""
+    resp = client.get('/employees?expand=undefined_related_model&format=ndjson')
+    assert resp.status_code == 400
+
+
+def test_retrieve_employee_with_fields(client):
+    """Tests fetching an employee from /employees/key view including only some fields, of it and its related models"""
+    resp = client.get('/employees/2?expand=manager.office&expand=office&fields=id,last&fields=manager.first,office')
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == {
+        'id': 2,
+        'last': 'Smith',
+        'manager': {'first': 'Patricia'},
+        'office': {'id': 2, 'city': 'New York', 'country': 'United States', 'address': '20 W 34th St'},
+    }
+
+
+def test_list_employees_with_fields(client):
+    """Tests fetching employees from /employees view including only some fields, in both JSON and NDJSON formats"""
+    expected = [{'id': e.id, 'first': e.first} for e in Employee.get(limit=10)]
+    resp = client.get('/employees?limit=10&expand=manager&fields=first,id')
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == expected
+
+    resp = client.get('/employees?limit=10&expand=manager&fields=first,id&format=ndjson')
+    assert resp.status_code == 200
+    assert [json.loads(line) for line in resp.data.decode().splitlines()] == expected
+
+
+def test_list_employees_with_undefined_field(client):
+    """Tests for 400 error when fetching from /employees including an undefined field"""
+    resp = client.get('/employees?fields=id,manager.undefined')
+    assert resp.status_code == 400
+    assert json.loads(resp.data)['error'] == "Employee has no 'undefined' field"
+
+
+def test_batch_retrieve_employees(client):
+    """
+    Tests fetching several employees by key from /employees view, in the requested order, expanding related models and
+    marking keys that were not found
+    """
+
+    resp = client.get('/employees?id=10&id=99999&id=2&expand=manager')
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [
+        Employee.get_by_key(10, with_related=['manager']).to_dict(),
+        {'id': 99999, 'error': 'Not found'},
+        Employee.get_by_key(2, with_related=['manager']).to_dict(),
+    ]
+
+
+def test_batch_retrieve_offices_with_post(client):
+    """Tests fetching several offices by key from /offices view, sending the keys in the body of a POST request"""
+    resp = client.post('/offices?fields=id,city', data=json.dumps([3, 1, 3]))
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [
+        {'id': 3, 'city': 'London'}, {'id': 1, 'city': 'San Francisco'}, {'id': 3, 'city': 'London'},
+    ]
+
+
+def test_batch_retrieve_with_invalid_keys(client):
+    """Tests for 400 error when fetching several departments by key with invalid keys"""
+    assert client.get('/departments?id=1&id=first').status_code == 400
+    assert client.post('/departments', data='{"id": 1}').status_code == 400
+
+
+def test_list_employees_with_filters(client):
+    """Tests filtering employees from /employees view by equality and by several values of their fields"""
+    all_employees = [e.to_dict() for e in Employee.get()]
+
+    resp = client.get('/employees?department=5&office=2&limit=1000')
+    assert resp.status_code == 200
+    assert json.loads(resp.data) == [e for e in all_employees if e['department'] == 5 and e['office'] == 2]
+
+    resp = client.get('/employees?department=4,5&department=6&manager=null&limit=1000&expand=department')
+    assert resp.status_code == 200
+    data = json.loads(resp.data)
+    assert [e['id'] for e in data] == \
+        [e['id'] for e in all_employees if e['department'] in (4, 5, 6) and e['manager'] is None]
+    assert data and all(e['department']['id'] in (4, 5, 6) for e in data)
+
+
+def test_list_employees_with_invalid_filters(client):
+    """Tests for 400 error when filtering employees by invalid values"""
+    assert client.get('/employees?department=first').status_code == 400
+    assert client.get('/offices?country=null').status_code == 400
+
+
+def test_list_employees_ordered_with_cursor(client):
+    """Tests ordering employees from /employees view, and paging through them with the X-Next-Cursor header"""
+    expected = sorted((e.to_dict() for e in Employee.get() if e.department in (1, 2)),
+                      key=lambda e: (e['last'], e['id']), reverse=True)
+
+    resp = client.get('/employees?order_by=-last&department=1,2&limit=7')
+    assert resp.status_code == 200
+    pages = [json.loads(resp.data)]
+    while 'X-Next-Cursor' in resp.headers:
+        resp = client.get(f'/employees?department=1,2&limit=7&cursor={resp.headers["X-Next-Cursor"]}')
+        assert resp.status_code == 200
+        pages.append(json.loads(resp.data))
+    assert [e for page in pages for e in page] == expected
+    assert all(len(page) == 7 for page in pages[:-1])
+
+    resp = client.get('/employees?limit=3&offset=10')
+    next_page = client.get(f'/employees?limit=3&cursor={resp.headers["X-Next-Cursor"]}')
+    assert json.loads(next_page.data) == [e.to_dict() for e in Employee.get(limit=3, offset=13)]
+
+
+def test_list_employees_with_invalid_order_or_cursor(client):
+    """Tests for 400 error when ordering employees by an unknown field, or with an invalid cursor"""
+    assert client.get('/employees?order_by=salary').status_code == 400
+    assert client.get('/employees?cursor=invalid').status_code == 400
+    cursor = client.get('/employees?order_by=first&limit=2').headers['X-Next-Cursor']
+    assert client.get(f'/employees?order_by=last&cursor={cursor}').status_code == 400
+    # Cursor values are converted to the type of the order_by field, and rejected if they can't be
+    for tampered, status_code in ((['first', 5, 1], 200), (['department', 'x', 1], 400), (['-salary', 1, 1], 400)):
+        tampered_cursor = urlsafe_b64encode(json.dumps(tampered).encode()).decode()
+        assert client.get(f'/employees?cursor={tampered_cursor}').status_code == status_code
+
+
+def test_list_employees_without_keyset_pagination_support(client, monkeypatch):
+    """Tests that no cursor is offered when the data accessor can't fetch objects after it (i.e. the employees API)"""
+    rows = [e.to_dict() for e in Employee.get()]
+    with LocalEmployeesApi(rows) as api:
+        monkeypatch.setattr(Employee, '_data_accessor', JsonRestApiDataAccessor(api.url, timeout=5.))
+        resp = client.get('/employees?limit=2')
+        assert resp.status_code == 200
+        assert json.loads(resp.data) == rows[:2]
+        assert 'X-Next-Cursor' not in resp.headers
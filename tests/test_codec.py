@@ -0,0 +1,22 @@
+from pytest import raises
+from codec import available_codecs, get_codec, JsonCodec
+import io
+
+
+def test_codecs_encode_and_decode_same_data():
+    """All installed codecs should decode what they encode, and what the standard library json codec encodes"""
+    data = [{'id': 1, 'first': 'Zoë', 'manager': None, 'office': {'id': 2, 'address': '20 W 34th St'}}]
+    for json_codec in available_codecs().values():
+        assert json_codec.loads(json_codec.dumps(data)) == data
+        assert json_codec.loads(JsonCodec().dumps(data)) == data
+        assert json_codec.load(io.BytesIO(json_codec.dumps(data))) == data
+
+
+def test_get_codec():
+    """get_codec should return the requested codec, falling back to the standard library json codec"""
+    assert get_codec('json').name == 'json'
+    assert get_codec().name == next(iter(available_codecs()))
+    for name in ['orjson', 'ujson']:
+        assert get_codec(name).name == (name if name in available_codecs() else 'json')
+    with raises(ValueError):
+        get_codec('undefined')
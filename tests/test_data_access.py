@@ -0,0 +1,532 @@
+from data_access import JsonRestApiDataAccessor, CachedDataAccessor, MirroredDataAccessor, CircuitBreaker, \
+    DataAccessor, DataSnapshot, MmapJsonFileDataAccessor, InMemoryJsonFileDataAccessor, compile_snapshot, \
+    read_snapshot, consistent_snapshots
+from models import Model, IntegerField, StringField, ModelField
+from models.concurrency import BoundedExecutor
+from tests.utils import LocalEmployeesApi
+from concurrent.futures import ThreadPoolExecutor
+from pytest import raises
+from time import sleep, perf_counter
+from threading import Event
+from functools import partial
+import json
+import os
+
+
+class Person(Model):
+    id = IntegerField(is_key=True)
+    name = StringField()
+
+
+PEOPLE = [{'id': i, 'name': f'Person {i}'} for i in range(1, 21)]
+
+
+def test_json_rest_api_reuses_connections():
+    """Consecutive requests through a JsonRestApiDataAccessor should reuse the same keep-alive connection"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5.)
+        for offset in range(0, 20, 5):
+            assert [p.id for p in accessor.get(Person, limit=5, offset=offset)] == list(range(offset + 1, offset + 6))
+        assert accessor.get_by_keys(Person, 3, 4)[1].name == 'Person 4'
+        assert accessor.connection_stats == {'requests': 5, 'new_connections': 1, 'reused_connections': 4}
+
+
+def test_json_rest_api_shares_connection_pool_across_threads():
+    """Requests sent from several threads should never open more connections than threads"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., pool_size=4)
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda k: accessor.get_by_key(Person, k), [k for k in range(1, 21)] * 3))
+        assert [p.id for p in results] == list(range(1, 21)) * 3
+        stats = accessor.connection_stats
+        assert stats['requests'] == 60
+        assert stats['new_connections'] <= 4
+
+
+class FakeClock:
+    """Clock that only moves forward when told to, to test time dependant logic"""
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cached_data_accessor_fetches_only_missing_keys():
+    """Only the keys that are not cached should be fetched from the wrapped data accessor"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = CachedDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.))
+        assert [p.id for p in accessor.get_by_keys(Person, 1, 2)] == [1, 2]
+        assert [p.id for p in accessor.get_by_keys(Person, 3, 2, 1)] == [3, 2, 1]
+        assert api.requests == ['/?id=1&id=2', '/?id=3']
+        assert accessor.cache_stats['objects'] == {'hits': 2, 'stale_hits': 0, 'misses': 3, 'evictions': 0}
+
+
+def test_cached_data_accessor_pages_and_ttl():
+    """Pages should be cached by limit and offset, and their objects by key, until their ttl expires"""
+    clock = FakeClock()
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = CachedDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.), ttl=10., clock=clock)
+        assert [p.id for p in accessor.get(Person, limit=5)] == [1, 2, 3, 4, 5]
+        assert [p.id for p in accessor.get(Person, limit=5, offset=0)] == [1, 2, 3, 4, 5]
+        assert accessor.get_by_key(Person, 4).name == 'Person 4'
+        assert len(api.requests) == 1
+        clock.now = 10.
+        accessor.get(Person, limit=5)
+        accessor.get_by_key(Person, 20)
+        assert len(api.requests) == 3
+
+
+def test_cached_data_accessor_evicts_least_recently_used():
+    """Once max_entries objects are cached, the least recently used should be evicted"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = CachedDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.), max_entries=2)
+        accessor.get_by_keys(Person, 1, 2)
+        accessor.get_by_key(Person, 1)
+        accessor.get_by_key(Person, 3)
+        accessor.get_by_keys(Person, 1, 3)
+        assert accessor.cache_stats['objects']['evictions'] == 1
+        assert len(api.requests) == 2
+        accessor.get_by_key(Person, 2)
+        assert len(api.requests) == 3
+
+
+def test_json_rest_api_coalesces_concurrent_identical_requests():
+    """Concurrent requests for the same set of keys should share a single request to the API"""
+    with LocalEmployeesApi(PEOPLE, delay=.3) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5.)
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda keys: accessor.get_by_keys(Person, *keys), [(1, 2), (2, 1, 2)] * 4))
+        assert all(sorted(p.id for p in people) == [1, 2] for people in results)
+        assert api.requests == ['/?id=1&id=2']
+        assert accessor.coalescing_stats == {'calls': 8, 'shared_calls': 7}
+
+
+def test_json_rest_api_splits_keys_in_chunks():
+    """Keys should be requested in chunks limited by quantity and url length, and merged regardless of their order"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(
+            api.url, timeout=5., max_keys_per_request=3, max_url_length=len(api.url) + 30
+        )
+        people = accessor.get_by_keys(Person, *range(20, 0, -1), 5, 99)
+        assert sorted(p.id for p in people) == list(range(1, 21))
+        assert all(len(api.url) + len(path) <= len(api.url) + 30 and path.count('id=') <= 3 for path in api.requests)
+        assert sorted(int(k) for path in api.requests for k in path[2:].replace('id=', '').split('&')) == \
+            list(range(1, 21)) + [99]
+
+
+def test_json_rest_api_reports_failed_chunks():
+    """If some chunks of keys fail, a ChunkedFetchError should report the keys and error of each failed chunk"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., max_keys_per_request=5)
+        api.get_rows = lambda query: \
+            1 / 0 if '13' in query['id'] else [r for r in PEOPLE if str(r['id']) in query['id']]
+        with raises(JsonRestApiDataAccessor.ChunkedFetchError) as e:
+            accessor.get_by_keys(Person, *range(1, 21))
+        assert e.value.total_chunks == 4
+        assert [chunk_keys for chunk_keys, _ in e.value.errors] == [[1, 10, 11, 12, 13]]
+        assert 'Error fetching data: 500' in str(e.value)
+
+    def exit_on_key_13(url):
+        if 'id=13' in url:
+            raise SystemExit()
+        return []
+
+    # Exits and interruptions are not reported as failed chunks, with or without executor
+    for max_workers in (1, 4):
+        accessor = JsonRestApiDataAccessor('http://localhost', max_keys_per_request=5, max_workers=max_workers)
+        accessor._get = exit_on_key_13
+        with raises(SystemExit):
+            accessor.get_by_keys(Person, *range(1, 21))
+
+
+def test_json_rest_api_fans_out_pages():
+    """Limits greater than page_size should be fetched as concurrent pages, collected in order, up to the last one"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., page_size=4, max_workers=3)
+        assert [p.id for p in accessor.get(Person, limit=10, offset=3)] == list(range(4, 14))
+        assert sorted(api.requests) == ['/?limit=2&offset=11', '/?limit=4&offset=3', '/?limit=4&offset=7']
+        del api.requests[:]
+        people = accessor.get(Person, limit=100, offset=2)
+        assert isinstance(people, list) and [p.id for p in people] == list(range(3, 21))
+        # Pages after the last one are only requested while it was in flight: at most max_workers - 1 of them
+        assert 5 <= len(api.requests) <= 5 + 2
+        assert [p.id for p in accessor.get(Person, limit=4)] == [1, 2, 3, 4]
+        assert '/?limit=4' in api.requests
+
+        api.get_rows = lambda query: 1 / 0
+        with raises(Exception, match='Error fetching data: 500'):
+            accessor.get(Person, limit=10)
+
+
+def test_mirrored_data_accessor_serves_local_copy():
+    """Mirrored data should be loaded by pages once, and served locally, keeping unchanged objects on refresh"""
+    with LocalEmployeesApi([dict(r) for r in PEOPLE]) as api:
+        accessor = MirroredDataAccessor(
+            JsonRestApiDataAccessor(api.url, timeout=5.), page_size=8, refresh_interval=None
+        )
+        assert [p.id for p in accessor.get(Person, limit=5, offset=10)] == list(range(11, 16))
+        assert [p.id for p in accessor.get_by_keys(Person, 20, 99, 1)] == [20, 1]
+        assert api.requests == [f'/?limit=8&offset={offset}' for offset in (0, 8, 16, 20)]
+
+        unchanged, changed = accessor.get_by_keys(Person, 1, 2)
+        api.rows[1]['name'] = 'Renamed'
+        api.rows.append({'id': 21, 'name': 'Person 21'})
+        accessor.refresh()
+        assert accessor.get_by_key(Person, 1) is unchanged
+        assert accessor.get_by_key(Person, 2).name == 'Renamed' and changed.name == 'Person 2'
+        assert len(accessor.get(Person)) == 21
+        assert accessor.mirror_stats['Person']['reused_objects'] == 19
+
+        # If the source fails, previous data keeps being served
+        api.get_rows = lambda query: 1 / 0
+        accessor.refresh()
+        assert len(accessor.get(Person)) == 21
+        assert accessor.mirror_stats['Person']['failed_refreshes'] == 1
+        assert '500' in accessor.mirror_stats['Person']['last_error']
+
+        # Sources that return less objects than requested per page are still mirrored whole
+        api.get_rows = lambda query: api.rows[int(query['offset'][0]):int(query['offset'][0]) + 5]
+        accessor.refresh()
+        assert [p.id for p in accessor.get(Person)] == list(range(1, 22))
+
+
+def test_mirrored_data_accessor_refreshes_in_background():
+    """Mirrored data should be refreshed every refresh_interval seconds by a background thread"""
+    with LocalEmployeesApi([dict(r) for r in PEOPLE]) as api:
+        accessor = MirroredDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.), refresh_interval=.05)
+        assert accessor.get_by_key(Person, 3).name == 'Person 3'
+        api.rows[2]['name'] = 'Renamed'
+        for _ in range(100):
+            if accessor.get_by_key(Person, 3).name == 'Renamed':
+                break
+            sleep(.02)
+        accessor.close()
+        assert accessor.get_by_key(Person, 3).name == 'Renamed'
+
+
+def test_cached_data_accessor_serves_stale_while_revalidating():
+    """Expired data should be served during stale_ttl while fetched in background, and also if fetching it fails"""
+    clock = FakeClock()
+    with LocalEmployeesApi([dict(r) for r in PEOPLE]) as api:
+        accessor = CachedDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.), ttl=10., stale_ttl=20., clock=clock)
+        assert accessor.get_by_key(Person, 1).name == 'Person 1'
+        assert [p.id for p in accessor.get(Person, limit=2)] == [1, 2]
+        api.rows[0]['name'] = 'Renamed'
+
+        clock.now = 15.
+        assert accessor.get_by_key(Person, 1).name == 'Person 1'
+        assert [p.name for p in accessor.get(Person, limit=2)] == ['Person 1', 'Person 2']
+        accessor._revalidator.submit(lambda: None).result()  # wait for background revalidations
+        assert accessor.get_by_key(Person, 1).name == 'Renamed'
+        assert accessor.cache_stats['revalidations'] == {'revalidations': 2, 'failed_revalidations': 0}
+
+        api.get_rows = lambda query: 1 / 0
+        clock.now = 30.
+        assert accessor.get_by_key(Person, 1).name == 'Renamed'
+        accessor._revalidator.submit(lambda: None).result()
+        assert accessor.cache_stats['revalidations']['failed_revalidations'] == 1
+        assert accessor.get_by_key(Person, 1).name == 'Renamed'
+
+        clock.now = 60.
+        with raises(Exception, match='500'):
+            accessor.get_by_key(Person, 1)
+
+
+def test_json_rest_api_circuit_breaker():
+    """After consecutive failures, requests should fail fast until a trial request succeeds after reset_timeout"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., circuit_failure_threshold=2, circuit_reset_timeout=.1,
+                                           retries=1, retry_backoff=0.)
+        get_rows = api.get_rows
+        api.get_rows = lambda query: 1 / 0
+        for _ in range(2):
+            with raises(ValueError, match='500'):
+                accessor.get_by_key(Person, 1)
+        with raises(CircuitBreaker.OpenError):
+            accessor.get_by_key(Person, 1)
+        # Only the outcome of each fetch, after its retry, counts as a failure
+        assert len(api.requests) == 4
+        assert accessor.circuit_breaker_stats == {
+            'state': 'open', 'consecutive_failures': 2, 'times_opened': 1, 'rejected_calls': 1
+        }
+
+        sleep(.1)
+        assert accessor.circuit_breaker_stats['state'] == 'half_open'
+        with raises(ValueError, match='500'):
+            accessor.get_by_key(Person, 1)
+        assert accessor.circuit_breaker_stats['state'] == 'open'
+
+        sleep(.1)
+        api.get_rows = get_rows
+        assert accessor.get_by_key(Person, 1).id == 1
+        assert accessor.circuit_breaker_stats['state'] == 'closed'
+
+
+def test_circuit_breaker_only_trial_call_decides_half_open_state():
+    """Calls started before the breaker opened should not close it, and errors that are not failures not open it"""
+    now = [0.]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10., clock=lambda: now[0],
+                             is_failure=lambda e: not isinstance(e, KeyError))
+
+    def fail(error: BaseException):
+        raise error
+
+    with raises(KeyError):
+        breaker.call(partial(fail, KeyError()))
+    assert breaker.state == 'closed'
+
+    slow_call_results = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        started = Event()
+        release = Event()
+        slow = executor.submit(breaker.call, lambda: started.set() or release.wait(5))
+        started.wait(5)
+        with raises(ValueError):
+            breaker.call(partial(fail, ValueError()))
+        assert breaker.state == 'open'
+
+        now[0] = 10.
+        trial_started = Event()
+        trial = executor.submit(breaker.call, lambda: trial_started.set() or fail(ValueError()))
+        trial_started.wait(5)
+        release.set()
+        slow_call_results.append(slow.result())
+        with raises(ValueError):
+            trial.result()
+    assert slow_call_results == [True]
+    assert breaker.state == 'open' and breaker.to_dict()['times_opened'] == 2
+
+
+def test_json_rest_api_retries_failed_requests():
+    """Requests failed with 5xx status codes should be retried, up to retries times"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., retries=2, retry_backoff=.01)
+        get_rows = api.get_rows
+        api.get_rows = lambda query: 1 / 0 if len(api.requests) < 3 else get_rows(query)
+        assert accessor.get_by_key(Person, 1).id == 1
+        api.get_rows = lambda query: 1 / 0
+        with raises(JsonRestApiDataAccessor.HttpStatusError):
+            accessor.get_by_key(Person, 2)
+        assert len(api.requests) == 6
+        assert accessor.request_stats == {'fetches': 2, 'retries': 4, 'hedges': 0, 'hedge_wins': 0}
+
+
+def test_json_rest_api_hedges_slow_requests():
+    """Requests slower than the hedge_percentile of latencies should be sent again, using the first response"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., hedge_percentile=90., coalesce_requests=False)
+        for _ in range(20):
+            accessor.get_by_key(Person, 1)
+        assert accessor.request_stats['hedges'] == 0
+
+        # Only the first request of the next fetch is slow, so the hedge request should win
+        api.get_rows = lambda query: sleep(.5 if len(api.requests) == 21 else 0) or [PEOPLE[0]]
+        start = perf_counter()
+        assert accessor.get_by_key(Person, 1).id == 1
+        assert perf_counter() - start < .4
+        assert accessor.request_stats == {'fetches': 21, 'retries': 0, 'hedges': 1, 'hedge_wins': 1}
+
+
+def test_cached_data_accessor_caches_missing_keys():
+    """Keys not found should not be fetched again until negative_ttl expires, unless they are fetched in a page"""
+    clock = FakeClock()
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = CachedDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.), negative_ttl=5., clock=clock)
+        assert [p.id for p in accessor.get_by_keys(Person, 1, 98, 99)] == [1]
+        assert accessor.get_by_key(Person, 99) is None
+        assert [p.id for p in accessor.get_by_keys(Person, 98, 2)] == [2]
+        assert api.requests == ['/?id=1&id=98&id=99', '/?id=2']
+        assert accessor.cache_stats['missing_keys'] == {'hits': 2, 'stale_hits': 0, 'misses': 4, 'evictions': 0}
+
+        clock.now = 5.
+        assert accessor.get_by_key(Person, 99) is None
+        assert len(api.requests) == 3
+
+        # Without ttl, only keys not found are cached
+        api.requests.clear()
+        accessor = CachedDataAccessor(JsonRestApiDataAccessor(api.url, timeout=5.), ttl=0, negative_ttl=5., clock=clock)
+        for _ in range(2):
+            assert [p.id for p in accessor.get_by_keys(Person, 1, 99)] == [1]
+        assert api.requests == ['/?id=1&id=99', '/?id=1']
+
+
+def test_data_snapshot_filters_with_indexes():
+    """Filters should be resolved with lazily built indexes, keeping objects order"""
+    snapshot = DataSnapshot(Person.from_rows([{'id': i, 'name': f'Name {i % 3}'} for i in range(1, 21)]))
+    assert [p.id for p in snapshot.slice(filters={'name': ('Name 1',)})] == [1, 4, 7, 10, 13, 16, 19]
+    assert list(snapshot._indexes) == ['name']
+    assert [p.id for p in snapshot.slice(2, 1, filters={'name': ('Name 2', 'Name 0'), 'id': (3, 5, 6, 99)})] == [5, 6]
+    assert snapshot.slice(filters={'name': ('Name 9',)}) == []
+
+
+def test_json_rest_api_pushes_filters_down():
+    """Filters by filterable_fields should be sent to the API, and other (or null) filters raise UnsupportedQuery"""
+    with LocalEmployeesApi(PEOPLE) as api:
+        accessor = JsonRestApiDataAccessor(api.url, timeout=5., filterable_fields=['name'])
+        accessor.get(Person, limit=5, filters={'name': ('Person 1', 'Person 2')})
+        assert api.requests == ['/?limit=5&name=Person+1&name=Person+2']
+        with raises(DataAccessor.UnsupportedQuery):
+            accessor.get(Person, limit=5, filters={'id': (1,)})
+        with raises(DataAccessor.UnsupportedQuery, match='null'):
+            accessor.get(Person, limit=5, filters={'name': ('Person 1', None)})
+        assert len(api.requests) == 1
+
+
+def test_data_snapshot_orders_with_keyset_pagination():
+    """Ordered pages should be taken from sorted indexes, continuing after the informed (value, key) of an object"""
+    class Nickname(Model):
+        id = IntegerField(is_key=True)
+        name = StringField(nullable=True)
+
+    rows = [{'id': i, 'name': None if i == 7 else f'Name {i % 3}'} for i in range(1, 11)]
+    snapshot = DataSnapshot(Nickname.from_rows(rows))
+    expected = sorted(Nickname.from_rows(rows), key=lambda p: (p.name is None, p.name or '', p.id))
+    assert snapshot.slice(order_by='name') == expected
+    assert snapshot.slice(4, 2, order_by='-name') == list(reversed(expected))[2:6]
+    assert snapshot.slice(3, after=('Name 1', 4), order_by='name') == expected[5:8]
+    assert snapshot.slice(3, after=('Name 1', 4), order_by='-name') == list(reversed(expected))[6:9]
+    assert snapshot.slice(None, after=('Name 2', 8), order_by='name') == expected[-1:]
+    assert [p.id for p in snapshot.slice(2, after=(None, 5))] == [6, 7]
+    assert [p.id for p in snapshot.slice(2, after=(None, 5), filters={'name': ('Name 1',)})] == [10]
+
+    # Without order_by, objects are ordered by key, and pages continue after keys of objects removed since
+    reloaded = DataSnapshot(Nickname.from_rows([r for r in reversed(rows) if r['id'] != 5]))
+    assert [p.id for p in reloaded.slice(2, after=(None, 5))] == [6, 7]
+    assert [p.id for p in reloaded.slice(3, 1)] == [2, 3, 4]
+
+
+def test_mmap_json_file_data_accessor(tmp_path):
+    """JSON array and NDJSON files should be indexed by key in one pass, parsing only the fetched objects"""
+    rows = [{'id': i, 'name': f'Person {{"{i}"}}, \\\\ "id": {i + 100}'} for i in range(20, 0, -1)]
+    array_file, ndjson_file = tmp_path / 'people.json', tmp_path / 'people.ndjson'
+    array_file.write_text(json.dumps(rows, indent=2))
+    ndjson_file.write_text('\n'.join(json.dumps(r) for r in rows) + '\n')
+
+    for file in [array_file, ndjson_file]:
+        accessor = MmapJsonFileDataAccessor(str(file))
+        assert [p.to_dict() for p in accessor.get(Person, limit=3, offset=2)] == rows[2:5]
+        assert [p.to_dict() for p in accessor.get_by_keys(Person, 5, 99, 1)] == [rows[15], rows[19]]
+        assert [p.id for p in accessor.get(Person, limit=2, after=(None, 3))] == [2, 1]
+        assert len(accessor.get(Person)) == 20
+
+    (tmp_path / 'nested.json').write_text(json.dumps([{'id': 1, 'name': 'a', 'extra': {'nested': 1}}]))
+    with raises(ValueError, match='nested objects'):
+        MmapJsonFileDataAccessor(str(tmp_path / 'nested.json')).get(Person)
+
+
+def test_in_memory_json_file_data_accessor_loads_binary_snapshot(tmp_path):
+    """Valid snapshots should be loaded instead of the json file, and missing or stale ones ignored"""
+    json_file = tmp_path / 'people.json'
+    json_file.write_text(json.dumps(PEOPLE[::-1] + [{'id': 1, 'name': 'Duplicated'}]))
+    snapshot_file = compile_snapshot(str(json_file))
+    assert snapshot_file == f'{json_file}.snapshot'
+    assert read_snapshot(snapshot_file, str(json_file), key='name') is None
+    assert read_snapshot(snapshot_file, str(json_file)).key_order == list(range(19, -1, -1))
+    # Temporary files of snapshots that fail to be written are removed
+    (tmp_path / 'directory.snapshot').mkdir()
+    with raises(OSError):
+        compile_snapshot(str(json_file), str(tmp_path / 'directory.snapshot'))
+    assert not list(tmp_path.glob('*.tmp'))
+
+    accessor = InMemoryJsonFileDataAccessor(str(json_file), snapshot_path=snapshot_file)
+    assert accessor.from_snapshot
+    # Objects are paged through in key order with the prebuilt key index, without sorting them
+    assert None in accessor._get_data(Person)._sorted_indexes
+    assert [p.to_dict() for p in accessor.get(Person, limit=3, offset=1)] == PEOPLE[1:4]
+    assert [p.name for p in accessor.get_by_keys(Person, 20, 1)] == ['Person 20', 'Person 1']
+    assert len(accessor.get(Person)) == 20
+
+    # Modifying the json file makes the snapshot stale, so the json file is read again
+    json_file.write_text(json.dumps(PEOPLE[:2]))
+    os.utime(json_file, ns=(0, 0))
+    accessor = InMemoryJsonFileDataAccessor(str(json_file), snapshot_path=snapshot_file)
+    assert not accessor.from_snapshot
+    assert [p.id for p in accessor.get(Person)] == [1, 2]
+
+    accessor = InMemoryJsonFileDataAccessor(str(json_file), snapshot_path=str(tmp_path / 'missing.snapshot'))
+    assert not accessor.from_snapshot and len(accessor.get(Person)) == 2
+
+    # Snapshots that don't match the model are validated (and rejected) as json files would be
+    compile_snapshot(str(json_file))
+    (tmp_path / 'invalid.json').write_text(json.dumps([{'id': 'a', 'name': 'A'}]))
+    with raises(ModelField.InvalidValue):
+        InMemoryJsonFileDataAccessor(
+            str(tmp_path / 'invalid.json'), snapshot_path=compile_snapshot(str(tmp_path / 'invalid.json'))
+        ).get(Person)
+
+
+def test_in_memory_json_file_data_accessor_reloads_modified_file(tmp_path):
+    """Modified or replaced files should be reloaded in background, keeping previous data if they are invalid"""
+    json_file = tmp_path / 'people.json'
+    json_file.write_text(json.dumps(PEOPLE[:2]))
+    accessor = InMemoryJsonFileDataAccessor(str(json_file), reload_interval=.01)
+    try:
+        snapshot = accessor._get_data(Person)
+        assert accessor.reload() is False
+
+        # Replaced files (new inode) are reloaded too, while previous snapshots are left untouched
+        new_file = tmp_path / 'new.json'
+        new_file.write_text(json.dumps(PEOPLE[:5]))
+        os.replace(new_file, json_file)
+        deadline = perf_counter() + 5
+        while accessor.reloads < 1 and perf_counter() < deadline:
+            sleep(.01)
+        assert accessor.reloads == 1 and len(accessor.get(Person)) == 5
+        assert len(snapshot) == 2
+
+        # Once the background thread is stopped, reload can be called explicitly
+        accessor.close()
+        sleep(.05)
+        json_file.write_text('[{"id": 1, "name"')
+        assert accessor.reload() is False and accessor.failed_reloads == 1 and accessor.last_error
+        assert len(accessor.get(Person)) == 5
+        json_file.write_text(json.dumps(PEOPLE[:1]))
+        assert accessor.reload() is True and accessor.last_error is None
+        assert [p.name for p in accessor.get(Person)] == ['Person 1']
+
+        # Concurrent reloads of the same change are serialized, so the file is only reloaded once
+        json_file.write_text(json.dumps(PEOPLE[:3]))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert sorted(executor.map(lambda _: accessor.reload(), range(4))) == [False, False, False, True]
+        assert accessor.reloads == 3 and len(accessor.get(Person)) == 3
+    finally:
+        accessor.close()
+
+    # First accesses are not blocked by a reload reading the file
+    accessor = InMemoryJsonFileDataAccessor(str(json_file))
+    reading, resume = Event(), Event()
+    read = accessor._read
+
+    def slow_read():
+        reading.set()
+        resume.wait(5)
+        return read()
+
+    accessor._read = slow_read
+    json_file.write_text(json.dumps(PEOPLE[:4]))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        reloaded = executor.submit(accessor.reload)
+        assert reading.wait(5) and len(accessor.get(Person)) == 3
+        resume.set()
+        assert reloaded.result() is True
+    assert len(accessor.get(Person)) == 4
+
+
+def test_in_memory_json_file_data_accessor_keeps_snapshot_inside_consistent_snapshots(tmp_path):
+    """Inside consistent_snapshots, every call (also from executor tasks) should use the data of the first one"""
+    json_file = tmp_path / 'people.json'
+    json_file.write_text(json.dumps(PEOPLE[:2]))
+    accessor = InMemoryJsonFileDataAccessor(str(json_file))
+    executor = BoundedExecutor(2)
+    try:
+        with consistent_snapshots():
+            assert len(accessor.get(Person)) == 2
+            json_file.write_text(json.dumps(PEOPLE[:5]))
+            assert accessor.reload() is True
+            assert executor.run_all([partial(accessor.get, Person)] * 3) == [accessor.get(Person)] * 3
+            assert [p.id for p in accessor.get_by_keys(Person, 1, 5)] == [1]
+        assert len(accessor.get(Person)) == 5
+    finally:
+        executor.shutdown()
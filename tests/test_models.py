@@ -1,6 +1,7 @@
 from pytest import raises
 from flaskr import create_app
-from models import Model, ModelField
+from models import Model, ModelField, StringField
+from data_access import InMemoryJsonFileDataAccessor
 from tests.utils import sorted_by_id
 from tests.config_test import config_test
 
@@ -142,3 +143,110 @@ with app.app_context():
                 Employee(first='test', last='test'),
                 Office(city='test', country='test', address='test'),
             ], 'manager')
+
+    def test_get_employees_with_related_models_concurrently():
+        """Fetching related models concurrently should return the same results as fetching them sequentially"""
+        related_models = ['manager.department.superdepartment', 'manager.office', 'department', 'office']
+        sequential = [e.to_dict() for e in Employee.get(limit=50, with_related=related_models)]
+        Model.set_related_models_max_workers(3)
+        try:
+            assert [e.to_dict() for e in Employee.get(limit=50, with_related=related_models)] == sequential
+        finally:
+            Model.set_related_models_max_workers(None)
+
+    def test_concurrent_related_models_fetch_error():
+        """Errors raised while fetching related models concurrently should be raised as when fetched sequentially"""
+        class FailingDataAccessor(InMemoryJsonFileDataAccessor):
+            def get_by_keys(self, model_type, *keys):
+                raise ValueError('Error fetching data')
+
+        accessor = Office._data_accessor
+        Office._data_accessor = FailingDataAccessor('./tests/tests_static_data/offices.json')
+        Model.set_related_models_max_workers(3)
+        try:
+            with raises(ValueError, match='Error fetching data'):
+                Employee.get(limit=50, with_related=['manager', 'department', 'office'])
+        finally:
+            Model.set_related_models_max_workers(None)
+            Office._data_accessor = accessor
+
+    def test_fields_meta_info_is_computed_once_per_model():
+        """Fields meta info should be computed on Model subclass creation and shared by all of its objects"""
+        assert Employee._get_fields() is Employee._get_fields()
+        assert list(Employee._get_fields()) == ['id', 'first', 'last', 'manager', 'department', 'office']
+        assert Employee._get_fields()['manager'].name == 'manager'
+        assert Employee.key_field_name() == 'id'
+        assert Employee._related_models == {'manager': Employee, 'department': Department, 'office': Office}
+        assert Employee(id=3, first='test', last='test').key == 3
+
+    def test_model_without_key_field_fails():
+        """Creating an object of a Model with no key field should raise a Model.NoKey exception"""
+        class NoKeyModel(Model):
+            name = StringField()
+
+        with raises(Model.NoKey):
+            NoKeyModel(name='test')
+
+    def test_model_objects_have_slots_instead_of_dict():
+        """Model objects should hold their fields values in slots, without a per object __dict__"""
+        employee = Employee.get_by_key(1)
+        assert not hasattr(employee, '__dict__')
+        assert set(Employee.__slots__) == set(Employee._get_fields())
+        assert Employee.get_by_key(1) == employee
+        with raises(AttributeError):
+            employee.undefined_field = 'test'
+
+    def test_get_related_models_does_not_modify_original_objects():
+        """Related models should be set on copies of the original objects, sharing the fetched related objects"""
+        employees = Employee.get_by_keys(2, 10)
+        expanded = Employee.get_related_models(employees, 'manager.manager', 'office')
+        assert [e.manager for e in employees] == [1, 4]
+        assert [e.manager.key for e in expanded] == [1, 4]
+        assert all(e is not x for e, x in zip(employees, expanded))
+        assert Employee.get_related_models(expanded, 'office')[0].office is expanded[0].office
+
+    def test_from_rows_builds_same_objects_as_init():
+        """Model.from_rows should build the same objects as creating them one by one, converting untrusted values"""
+        rows = [
+            {'id': 1, 'first': 'a', 'last': 'b', 'manager': None, 'department': 5},
+            {'id': 2, 'first': 'c', 'last': 'd', 'manager': 1, 'office': 2},
+        ]
+        expected = [Employee(**row).to_dict() for row in rows]
+        assert [e.to_dict() for e in Employee.from_rows(rows)] == expected
+        assert [e.to_dict() for e in Employee.from_rows([{**rows[0], 'id': '1'}, rows[1]])] == expected
+
+    def test_from_rows_invalid_rows_errors():
+        """Model.from_rows should raise the same errors as creating objects with invalid rows one by one"""
+        with raises(TypeError, match="unexpected keyword argument 'undefined'"):
+            Office.from_rows([{'id': 1, 'city': 'a', 'country': 'b', 'address': 'c', 'undefined': 1}])
+        with raises(ValueError, match="city: 'city' field is not nullable"):
+            Office.from_rows([
+                {'id': 1, 'city': 'a', 'country': 'b', 'address': 'c'},
+                {'id': 2, 'city': None, 'country': 'b', 'address': 'c'},
+            ])
+
+    def test_compiled_relationships_are_cached():
+        """Relationships should be compiled once per model and set of relationships, into a hashable ExpansionPlan"""
+        plan = Employee.compile_relationships(['manager.office', 'office', 'manager.office', 'manager'])
+        assert plan is Employee.compile_relationships(['office', 'manager', 'manager.office'])
+        assert hash(plan) == hash(Employee.compile_relationships(['manager.office', 'office']))
+        assert [(r.field_name, r.related_model) for r in plan.relationships] == \
+            [('manager', Employee), ('office', Office)]
+        assert plan.relationships[0].next_level.relationships[0].related_model is Office
+        assert [e.to_dict() for e in Employee.get_by_keys(2, with_related=plan)] == \
+            [e.to_dict() for e in Employee.get_by_keys(2, with_related=['manager.office', 'office'])]
+
+    def test_compile_relationships_errors():
+        """Invalid relationships at any level should raise errors when compiling them"""
+        with raises(Model.UndefinedField, match="Office has no 'undefined' field"):
+            Employee.compile_relationships(['manager.office.undefined'])
+        with raises(Model.IncorrectModelType):
+            Office.get(with_related=Employee.compile_relationships(['office']))
+
+    def test_expansion_plan_pruned_to_selected_fields():
+        """Relationships whose fields are not selected should be removed from expansion plans"""
+        plan = Employee.compile_relationships(['manager.department', 'manager.office', 'department', 'office'])
+        pruned = plan.only(Employee.compile_fields(['id', 'manager.first', 'manager.office.city']))
+        assert [r.field_name for r in pruned.relationships] == ['manager']
+        assert [r.field_name for r in pruned.relationships[0].next_level.relationships] == ['office']
+        assert plan.only(None) is plan
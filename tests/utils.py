@@ -1,6 +1,10 @@
 from flask.testing import FlaskClient
 from models import ModelType
-from typing import Iterable, Hashable
+from typing import Iterable, Hashable, List, Dict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from threading import Thread
+from time import sleep
 import json
 
 
@@ -57,3 +61,68 @@ def _test_list_model(client: FlaskClient, url: str, model: ModelType, **get_kwar
     resp = client.get(url)
     assert resp.status_code is 200
     assert sorted_by_id(json.loads(resp.data)) == sorted_by_id([o.to_dict() for o in model.get(**get_kwargs)])
+
+
+class LocalEmployeesApi:
+    """
+    Local stand-in for the employees external API, to test (and benchmark) JsonRestApiDataAccessor without relying on
+    the actual API. It serves the informed rows on any path, supporting limit/offset and id query params. If get_rows
+    raises an error, it responds with a 500 status code. Use as a context manager:
+
+        with LocalEmployeesApi(rows) as api:
+            accessor = JsonRestApiDataAccessor(api.url)
+    """
+
+    def __init__(self, rows: List[Dict], delay: float = 0.):
+        """
+        :param rows: rows of data served by the api
+        :param delay: seconds to wait before responding every request
+        """
+
+        self.rows = rows
+        self.delay = delay
+        self._rows_by_key: Dict[int, Dict] = {}
+        self.requests: List[str] = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Required for keep-alive connections
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                api.requests.append(self.path)
+                sleep(api.delay)
+                try:
+                    status, body = 200, json.dumps(api.get_rows(parse_qs(urlparse(self.path).query))).encode()
+                except Exception as e:
+                    status, body = 500, str(e).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def get_rows(self, query: Dict[str, List[str]]) -> List[Dict]:
+        if 'id' in query:
+            # Rows are indexed by key (again whenever rows are added), so that large datasets can be benchmarked
+            if len(self._rows_by_key) != len(self.rows):
+                self._rows_by_key = {r['id']: r for r in self.rows}
+            rows_by_key = self._rows_by_key
+            return [rows_by_key[k] for k in dict.fromkeys(int(k) for k in query['id']) if k in rows_by_key]
+        offset = int(query.get('offset', [0])[0])
+        return self.rows[offset:offset + int(query.get('limit', [100])[0])]
+
+    def __enter__(self) -> 'LocalEmployeesApi':
+        Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
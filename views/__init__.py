@@ -1,4 +1,7 @@
 from .utils import *
+from .streaming import *
 from .view_function import *
+from .batch import *
+from .pagination import *
 from .list import *
 from .retrieve import *
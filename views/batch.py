@@ -0,0 +1,62 @@
+from flask import request
+from typing import Hashable, List, Optional
+from models import ModelType, ModelException
+from .view_function import ViewFunctionReturnType
+from .utils import get_expansion_query_params, json_response
+import codec
+
+
+def get_batch_keys(model: ModelType, key_param_name: Optional[str] = None) -> Optional[List[Hashable]]:
+    """
+    Util method that extracts the keys of a batch retrieve request: either a repeated query parameter (i.e.
+    ?id=1&id=2), or, for POST requests, a body with a JSON array of keys. Keys are converted to the type of the model's
+    key field. Raises ValueError if keys are invalid
+
+    :param model: the model of the objects to retrieve
+    :param key_param_name: name of the query parameter with the keys. Defaults to the name of the model's key field
+    :return: list of keys in the requested order, or None if it is not a batch retrieve request
+    """
+
+    if request.method == 'POST':
+        try:
+            keys = codec.loads(request.get_data() or b'null')
+        except Exception:
+            raise ValueError('Request body should be a JSON array of keys')
+        if not isinstance(keys, list):
+            raise ValueError('Request body should be a JSON array of keys')
+    else:
+        keys = request.args.getlist(key_param_name or model.key_field_name())
+        if not keys:
+            return None
+
+    key_field = model._get_fields()[model.key_field_name()]
+    try:
+        return [key_field.get_value(k) for k in keys]
+    except (ValueError, ModelException) as e:
+        raise ValueError(f'Invalid key: {e}')
+
+
+def batch_retrieve_view(model: ModelType, keys: List[Hashable], max_keys: int = None) -> ViewFunctionReturnType:
+    """
+    View to retrieve several objects of type model by their keys, with a single batched fetch. Results are returned in
+    the order of the requested keys. Keys that are not found are returned as an object with the key and a
+    'Not found' error, i.e. {"id": 5, "error": "Not found"}. Supports the same expand and fields query params as the
+    list and retrieve views
+
+    :param model: the model of the objects to retrieve
+    :param keys: keys of the objects to retrieve
+    :param max_keys: maximum quantity of keys allowed
+    :return: http response with either objects' data in JSON format and code 200 or error description and
+     corresponding status error code
+    """
+
+    if max_keys is not None and len(keys) > max_keys:
+        return json_response({'error': f'Too many keys requested, maximum is {max_keys}'}), 400
+
+    with_related, fields = get_expansion_query_params(model)
+    objects_by_key = {o.key: o for o in model.get_by_keys(*dict.fromkeys(keys), with_related=with_related)}
+    key_field_name = model.key_field_name()
+    return json_response([
+        objects_by_key[k].to_dict(fields=fields) if k in objects_by_key else {key_field_name: k, 'error': 'Not found'}
+        for k in keys
+    ]), 200
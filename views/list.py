@@ -1,30 +1,92 @@
-from flask import request, jsonify
+from flask import request
 from models import ModelType
 from .view_function import default_view_function, ViewFunctionReturnType
-from .utils import get_int_query_param, get_list_query_param
+from .utils import get_int_query_param, get_expansion_query_params, get_filter_query_params, json_response
+from .streaming import get_response_format, stream_json_response, JSON_FORMAT
+from .batch import get_batch_keys, batch_retrieve_view
+from .pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
 
 
 @default_view_function
 def list_view(model: ModelType, limit_param_name: str = 'limit', offset_param_name: str = 'offset',
-              default_limit: int = 100, max_limit: int = 1000) -> ViewFunctionReturnType:
+              default_limit: int = 100, max_limit: int = 1000, key_param_name: str = None,
+              order_by_param_name: str = 'order_by', cursor_param_name: str = 'cursor') -> ViewFunctionReturnType:
     """
     Default view to retrieve a list of objects of type model. It supports limit thq quantity of results, and the start
-     offset. TODO A more complete version should support filters, ordering and advanced pagination
+     offset. Results can be filtered by query params named after the model's fields, with one or several values
+     separated by commas (i.e. department=5,6&office=2), and ordered by a field (i.e. order_by=-first for descending
+     order).
+     If the model's data accessor supports keyset pagination, full pages include an X-Next-Cursor header with a cursor
+     to fetch the next page (cursor query param), which continues right after the last object of the page instead of
+     skipping offset objects.
+     Results can be streamed as a JSON array (format=stream query param) or as NDJSON (format=ndjson query param, or
+     Accept: application/x-ndjson header). A fields query param selects the fields to include (i.e.
+     fields=id,first,manager.first).
+     If keys are informed (repeating the key query param, i.e. ?id=1&id=2, or as a JSON array in the body of a POST
+     request), objects are retrieved by key in a single batch instead (see batch_retrieve_view)
 
     :param model: the model of the objects to retrieve
     :param limit_param_name: name of query parameter to define the limit of objects to be returned
     :param offset_param_name: name of query parameter to define the start offset to retrieve objects from
     :param default_limit: default limit value. If not None, will be used whenever a limit value is not provided
-    :param max_limit: maximum value of limit, in case a greater value of limit is provided, it is capped to this value
+    :param max_limit: maximum value of limit, in case a greater value of limit is provided, it is capped to this value.
+     It is also the maximum quantity of keys of batch retrieve requests
+    :param key_param_name: name of query parameter with keys for batch retrieve requests. Defaults to the name of the
+     model's key field
+    :param order_by_param_name: name of query parameter with the field to order objects by
+    :param cursor_param_name: name of query parameter with the cursor of the page to retrieve
     :return: http response with either objects' data in JSON format and code 200 or error description and
      corresponding status error code
     """
 
-    if request.method != 'GET':
-        return jsonify({'error': f'Method {request.method} not allowed'}), 405
+    if request.method not in ('GET', 'POST'):
+        return json_response({'error': f'Method {request.method} not allowed'}), 405
 
-    return jsonify([o.to_dict() for o in model.get(
-        limit=get_int_query_param(limit_param_name, default=default_limit, min_value=1, max_value=max_limit),
+    try:
+        keys = get_batch_keys(model, key_param_name)
+    except ValueError as e:
+        return json_response({'error': str(e)}), 400
+    if keys is not None:
+        return batch_retrieve_view(model, keys, max_keys=max_limit)
+
+    order_by = request.args.get(order_by_param_name) or None
+    cursor = request.args.get(cursor_param_name)
+    try:
+        filters = get_filter_query_params(model, excluded_param_names=[
+            key_param_name or model.key_field_name(), limit_param_name, offset_param_name, order_by_param_name,
+            cursor_param_name,
+        ])
+        after = None
+        if cursor:
+            cursor_order_by, after = decode_cursor(model, cursor)
+            if order_by is not None and order_by != cursor_order_by:
+                raise ValueError(f'Cursor was not built for order_by={order_by}')
+            order_by = cursor_order_by
+    except ValueError as e:
+        return json_response({'error': str(e)}), 400
+    # Filters, ordering and cursors are only sent to the data accessor when informed, as not every data accessor
+    #  supports them
+    query_kwargs = {k: v for k, v in [('filters', filters), ('order_by', order_by), ('after', after)] if v}
+
+    limit = get_int_query_param(limit_param_name, default=default_limit, min_value=1, max_value=max_limit)
+    with_related, fields = get_expansion_query_params(model)
+    objects = model.get(
+        limit=limit,
         offset=get_int_query_param(offset_param_name, min_value=0),
-        with_related=get_list_query_param('expand', remove_duplicates=True),
-    )])
+        with_related=with_related,
+        **query_kwargs,
+    )
+
+    # Streamed formats encode objects one by one while sending the response, instead of building it all in memory
+    response_format = get_response_format()
+    if response_format != JSON_FORMAT:
+        response = stream_json_response(objects, response_format, fields=fields)
+    else:
+        response = json_response([o.to_dict(fields=fields) for o in objects])
+
+    # The next cursor is only known for full pages already in memory (streamed iterators are not consumed yet), and
+    #  only offered if the model's data accessor supports fetching objects after it
+    if limit and model._data_accessor.supports_keyset_pagination and isinstance(objects, (list, tuple)) and \
+            len(objects) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(order_by, objects[-1])
+    return response
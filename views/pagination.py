@@ -0,0 +1,44 @@
+from models import Model, ModelType, ModelException
+from typing import Optional, Tuple, Any, Hashable
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+import codec
+
+# Response header with the cursor to fetch the next page of a list view
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(order_by: Optional[str], last_object: Model) -> str:
+    """
+    Util method that returns an opaque cursor token pointing right after last_object, for keyset pagination. It holds
+    the order_by field, and the values of that field and of the key of last_object
+
+    :param order_by: field name the objects are ordered by (with a '-' prefix for descending order), or None
+    :param last_object: last object of the current page
+    :return: url safe token
+    """
+
+    value = getattr(last_object, order_by.lstrip('-')) if order_by else None
+    if isinstance(value, Model):
+        value = value.key
+    return urlsafe_b64encode(codec.dumps([order_by, value, last_object.key])).rstrip(b'=').decode()
+
+
+def decode_cursor(model: ModelType, cursor: str) -> Tuple[Optional[str], Tuple[Any, Hashable]]:
+    """
+    Util method that decodes a cursor token built by encode_cursor. Raises ValueError if it is not a valid cursor
+
+    :param model: the model of the objects being listed
+    :param cursor: cursor token
+    :return: order_by field name (or None), and (order_by field value, key) of the object to list objects after
+    """
+
+    try:
+        order_by, value, key = codec.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if order_by is not None and not isinstance(order_by, str):
+            raise ValueError('order_by should be a str')
+        fields = model._get_fields()
+        if order_by is not None:
+            value = fields[order_by.lstrip('-')].get_value(value)
+        return order_by, (value, fields[model.key_field_name()].get_value(key))
+    except (ValueError, TypeError, KeyError, ModelException) as e:
+        raise ValueError(f'Invalid cursor: {e}')
@@ -1,14 +1,15 @@
-from flask import request, jsonify
+from flask import request
 from typing import Hashable
 from models import ModelType
 from .view_function import default_view_function, ViewFunctionReturnType
-from .utils import get_list_query_param
+from .utils import get_expansion_query_params, json_response
 
 
 @default_view_function
 def retrieve_view(model: ModelType, key: Hashable) -> ViewFunctionReturnType:
     """
-    Default view to retrieve a single object of type model, given its key. It returns 404 if does not exist
+    Default view to retrieve a single object of type model, given its key. It returns 404 if does not exist. A fields
+     query param selects the fields to include (i.e. fields=id,first,manager.first)
 
     :param model: the model of the object to retrieve
     :param key: the key of the object to retrieve
@@ -17,11 +18,12 @@ def retrieve_view(model: ModelType, key: Hashable) -> ViewFunctionReturnType:
     """
 
     if request.method != 'GET':
-        return jsonify({'error': f'Method {request.method} not allowed'}), 405
+        return json_response({'error': f'Method {request.method} not allowed'}), 405
 
-    obj = model.get_by_key(key, with_related=get_list_query_param('expand', remove_duplicates=True))
+    with_related, fields = get_expansion_query_params(model)
+    obj = model.get_by_key(key, with_related=with_related)
 
     if not obj:
-        return jsonify({'error': 'Not found'}), 404
+        return json_response({'error': 'Not found'}), 404
 
-    return jsonify(obj.to_dict())
+    return json_response(obj.to_dict(fields=fields))
@@ -0,0 +1,79 @@
+from flask import request
+from flask.wrappers import Response
+from models import Model, FieldSelection
+from typing import Iterable, Iterator, Optional
+import codec
+
+# Response formats for list views. JSON_FORMAT builds the whole response before sending it, while STREAM_FORMAT (a
+#  JSON array) and NDJSON_FORMAT (one JSON object per line) encode and send objects as they are serialized
+JSON_FORMAT = 'json'
+STREAM_FORMAT = 'stream'
+NDJSON_FORMAT = 'ndjson'
+RESPONSE_FORMATS = (JSON_FORMAT, STREAM_FORMAT, NDJSON_FORMAT)
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson')
+
+
+def get_response_format(param_name: str = 'format') -> str:
+    """
+    Util method that determines the response format requested by the client: the value of the param_name query
+    parameter, if informed and valid. Otherwise, NDJSON_FORMAT if it is preferred over JSON in the Accept header, or
+    JSON_FORMAT by default
+
+    :param param_name: name of the query parameter
+    :return: one of RESPONSE_FORMATS
+    """
+
+    response_format = request.args.get(param_name)
+    if response_format in RESPONSE_FORMATS:
+        return response_format
+
+    best_match = request.accept_mimetypes.best_match(('application/json',) + NDJSON_MIMETYPES)
+    return NDJSON_FORMAT if best_match in NDJSON_MIMETYPES else JSON_FORMAT
+
+
+def _encode_objects(objects: Iterable[Model], ndjson: bool, buffer_size: int,
+                    fields: Optional[FieldSelection]) -> Iterator[bytes]:
+    """Encodes objects one by one, yielding chunks of about buffer_size bytes"""
+
+    chunk = [] if ndjson else [b'[']
+    chunk_size = 0
+    for i, obj in enumerate(objects):
+        encoded = codec.dumps(obj.to_dict(fields=fields))
+        if ndjson:
+            chunk += [encoded, b'\n']
+        elif i:
+            chunk += [b',', encoded]
+        else:
+            chunk.append(encoded)
+        chunk_size += len(encoded)
+        if chunk_size >= buffer_size:
+            yield b''.join(chunk)
+            chunk, chunk_size = [], 0
+
+    if not ndjson:
+        chunk.append(b']')
+    if chunk:
+        yield b''.join(chunk)
+
+
+def stream_json_response(objects: Iterable[Model], response_format: str, buffer_size: int = 16384,
+                         status: Optional[int] = 200, fields: Optional[FieldSelection] = None) -> Response:
+    """
+    Returns a streamed response with the objects' data, encoding them as the response is sent so that the whole
+    response body is never held in memory
+
+    :param objects: models to send
+    :param response_format: STREAM_FORMAT for a JSON array, NDJSON_FORMAT for one JSON object per line
+    :param buffer_size: approximate size of each chunk of the response
+    :param status: response status code
+    :param fields: if informed, only these fields of the objects are included (see Model.compile_fields)
+    :return: http response
+    """
+
+    ndjson = response_format == NDJSON_FORMAT
+    return Response(
+        _encode_objects(objects, ndjson, buffer_size, fields),
+        status=status,
+        mimetype='application/x-ndjson' if ndjson else 'application/json',
+    )
@@ -1,5 +1,8 @@
 from flask import request
-from typing import Optional, List, Hashable
+from flask.wrappers import Response
+from typing import Optional, List, Hashable, Any, Tuple, Dict, Iterable
+from models import ModelType, ModelException, ExpansionPlan, FieldSelection
+import codec
 
 
 def get_int_query_param(param_name: str, raise_error: bool = False, default: int = None, min_value: int = None,
@@ -39,7 +42,8 @@ def get_int_query_param(param_name: str, raise_error: bool = False, default: int
     )
 
 
-def get_list_query_param(param_name: str, raise_error: bool = False, remove_duplicates: bool = False) -> Optional[List]:
+def get_list_query_param(param_name: str, raise_error: bool = False, remove_duplicates: bool = False,
+                         separator: str = None) -> Optional[List]:
     """
     Util method that extracts a list from query parameters
 
@@ -48,9 +52,12 @@ def get_list_query_param(param_name: str, raise_error: bool = False, remove_dupl
      If False, just ignores the value in case of error
     :param remove_duplicates: determines if duplicates should be removed from resulting list. It only works if all
      elements of the list ar Hashable. In case there is at least one non Hashable element, this is ignored
+    :param separator: if informed, each value of the query parameter is split by it (i.e. fields=id,first&fields=last)
     :return: list of values
     """
     values = request.args.getlist(param_name)
+    if separator is not None:
+        values = [v for value in values for v in value.split(separator) if v]
     if not values:
         return None
 
@@ -58,3 +65,61 @@ def get_list_query_param(param_name: str, raise_error: bool = False, remove_dupl
         return list(set(values))
 
     return values
+
+
+def get_expansion_query_params(model: ModelType, expand_param_name: str = 'expand',
+                               fields_param_name: str = 'fields') -> Tuple[ExpansionPlan, Optional[FieldSelection]]:
+    """
+    Util method that extracts the relationships to expand, and the fields to include in the response, from query
+    parameters. Relationships are pruned to the selected fields, so that related models that won't be included in the
+    response are not fetched
+
+    :param model: the model of the objects to retrieve
+    :param expand_param_name: name of query parameter with relationships to expand (i.e. expand=manager.office)
+    :param fields_param_name: name of query parameter with fields to include, separated by commas (i.e.
+     fields=id,first,manager.first). If not informed, all fields are included
+    :return: the relationships ExpansionPlan, and the FieldSelection (None for all fields)
+    """
+
+    fields = model.compile_fields(get_list_query_param(fields_param_name, remove_duplicates=True, separator=','))
+    plan = model.compile_relationships(get_list_query_param(expand_param_name, remove_duplicates=True))
+    return plan.only(fields), fields
+
+
+def get_filter_query_params(model: ModelType, excluded_param_names: Iterable[str] = ()
+                            ) -> Optional[Dict[str, Tuple[Hashable, ...]]]:
+    """
+    Util method that extracts filters from query parameters named after the model's fields. Each parameter can be
+    repeated, or hold several values separated by commas, to filter by any of them (i.e. department=5,6&office=2).
+    Values are converted to the type of their field, and the value null filters by None. Raises ValueError if a value
+    is invalid
+
+    :param model: the model of the objects to retrieve
+    :param excluded_param_names: names of query parameters that are not filters, even if named after a field
+    :return: dict with field names and their allowed values, or None if there are no filters
+    """
+
+    filters = {}
+    for field_name, field in model._get_fields().items():
+        if field_name in excluded_param_names:
+            continue
+        values = get_list_query_param(field_name, remove_duplicates=True, separator=',')
+        if not values:
+            continue
+        try:
+            filters[field_name] = tuple(field.get_value(None if v == 'null' else v) for v in values)
+        except (ValueError, ModelException) as e:
+            raise ValueError(f"Invalid value for filter '{field_name}': {e}")
+    return filters or None
+
+
+def json_response(obj: Any) -> Response:
+    """
+    Util method that returns a JSON response with obj encoded by the project's JSON codec. Replaces flask's jsonify,
+    which always uses the standard library json module
+
+    :param obj: data to encode
+    :return: http response with application/json mimetype
+    """
+
+    return Response(codec.dumps(obj), mimetype='application/json')